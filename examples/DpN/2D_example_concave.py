@@ -1,9 +1,10 @@
 import sys
 
 sys.path.insert(0, "./")
-import autograd.numpy as np
+import jax.numpy as jnp
 import matplotlib.pyplot as plt
-from autograd import hessian, jacobian
+import numpy as np
+from jax import jacfwd, jacrev, jit
 from matplotlib import rcParams
 
 from hvd.newton import DpN
@@ -24,15 +25,17 @@ rcParams["ytick.major.width"] = 1
 np.random.seed(66)
 
 
-def F(x):
-    x = np.array(x)
-    return np.array([1 - np.exp(-np.sum((x - 1) ** 2)), 1 - np.exp(-np.sum((x + 1) ** 2))])
+def _F(x):
+    return jnp.array([1 - jnp.exp(-jnp.sum((x - 1) ** 2)), 1 - jnp.exp(-jnp.sum((x + 1) ** 2))])
 
 
 # TODO: the objective Hessian can be indefinite; find a systematic way to handle it
 # Also, on concave Pareto front, the overall IGD Hessian can be indefinite.
-Jacobian = jacobian(F)
-Hessian = hessian(F)
+_Jacobian = jit(jacrev(_F))
+_Hessian = jit(jacfwd(jacrev(_F)))
+F = lambda x: np.array(_F(x))
+Jacobian = lambda x: np.array(_Jacobian(x))
+Hessian = lambda x: np.array(_Hessian(x))
 
 p = np.linspace(-1, 1, 100)
 ref_x = np.c_[p, p]
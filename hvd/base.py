@@ -4,6 +4,8 @@ from typing import Callable, Self, Tuple
 
 import numpy as np
 
+from .utils import evaluate_batch
+
 
 class State:
     def __init__(
@@ -19,6 +21,8 @@ class State:
         g: Callable = None,
         g_jac: Callable = None,
         g_hess: Callable = None,
+        func_batch: Callable = None,
+        jac_batch: Callable = None,
     ) -> None:
         """State object of numerical optimization
 
@@ -34,6 +38,10 @@ class State:
             g (Callable, optional): inequality constraint. Defaults to None.
             g_jac (Callable, optional): Jacobian of the inequality constraint. Defaults to None.
             g_hess (Callable, optional): Hessian of the inequality constraint. Defaults to None.
+            func_batch (Callable, optional): batched objective function, which takes points of shape (N, n_var)
+                and returns an array of shape (N, n_obj); it is preferred over `func`. Defaults to None.
+            jac_batch (Callable, optional): batched Jacobian of the objective function, which returns an array
+                of shape (N, n_obj, n_var); it is preferred over `jac`. Defaults to None.
         """
         self.n_var: int = n_var  # the number of the primal variables
         self.n_eq: int = n_eq
@@ -47,6 +55,8 @@ class State:
         self.g: Callable = g
         self.g_jac: Callable = g_jac
         self.g_hess: Callable = g_hess
+        self.func_batch: Callable = func_batch
+        self._jac_batch: Callable = jac_batch
         self._constrained: bool = self.g is not None or self.h is not None
         self.n_jac_evals: int = 0
         self.n_cstr_jac_evals: int = 0
@@ -61,6 +71,11 @@ class State:
         self.n_jac_evals += 1
         return self._jac(x)
 
+    def jac_batch(self, X: np.ndarray) -> np.ndarray:
+        """Jacobians of the objective function at all rows of `X`"""
+        self.n_jac_evals += len(X)
+        return self._jac_batch(X)
+
     def evaluate_cstr(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         H = self.h(x) if self.h is not None else []
         G = self.g(x) if self.g is not None else []
@@ -94,8 +109,9 @@ class State:
     def update(self, X: np.ndarray, compute_gradient: bool = True):
         self.X = X.copy()
         primal_vars = self.primal
-        self.Y = np.array([self.func(x) for x in primal_vars])
-        self.J = np.array([self.jac(x) for x in primal_vars]) if compute_gradient else None
+        self.Y = evaluate_batch(self.func, primal_vars, self.func_batch)
+        jac_batch = self.jac_batch if self._jac_batch is not None else None
+        self.J = evaluate_batch(self.jac, primal_vars, jac_batch) if compute_gradient else None
         cstr_value, active_indices = list(zip(*[self.evaluate_cstr(x) for x in primal_vars]))
         self.cstr_value = np.array(cstr_value)
         self.active_indices = np.array(active_indices)
@@ -118,6 +134,22 @@ class State:
         if cstr_hess is not None:
             self.cstr_hess[k] = cstr_hess
 
+    def assign(self, indices: np.ndarray, state: Self):
+        """Copy the points of an already evaluated state into `indices` without evaluating them again
+
+        Args:
+            indices (np.ndarray): indices to overwrite
+            state (Self): the evaluated state of `len(indices)` points
+        """
+        self.X[indices] = state.X
+        self.Y[indices] = state.Y
+        self.J[indices] = state.J
+        if self._constrained:
+            self.cstr_value[indices] = state.cstr_value
+            self.active_indices[indices] = state.active_indices
+            self.cstr_grad[indices] = state.cstr_grad
+            self.cstr_hess[indices] = state.cstr_hess
+
     def is_feasible(self) -> np.ndarray:
         """Check whether the solutions are feasible.
         NOTE: the active iequality constraints are considered infeasible
@@ -169,6 +201,8 @@ class State:
             __dict__ = self.__dict__.copy()
             del __dict__["func"]
             del __dict__["_jac"]
+            del __dict__["func_batch"]
+            del __dict__["_jac_batch"]
             del __dict__["h"]
             del __dict__["h_jac"]
             del __dict__["h_hess"]
@@ -5,6 +5,8 @@ from scipy.optimize import linear_sum_assignment
 from scipy.spatial.distance import cdist, directed_hausdorff
 from sklearn_extra.cluster import KMedoids
 
+from .utils import evaluate_batch
+
 __authors__ = ["Hao Wang"]
 
 
@@ -16,6 +18,9 @@ class GenerationalDistance:
         jac: Callable = None,
         hess: Callable = None,
         p: float = 2,
+        func_batch: Callable = None,
+        jac_batch: Callable = None,
+        hess_batch: Callable = None,
     ):
         """Generational Distance
 
@@ -25,12 +30,22 @@ class GenerationalDistance:
             jac (Callable): the Jacobian function, which returns an array of shape (n_objective, dim)
             hess (Callable): the Hessian function, which returns an array of shape (n_objective, dim, dim)
             p (float, optional): parameter in the p-norm. Defaults to 2.
+            func_batch (Callable, optional): the batched objective function, which takes decision points of
+                shape (N, dim) and returns an array of shape (N, n_objective); it is preferred over `func`.
+                Defaults to None.
+            jac_batch (Callable, optional): the batched Jacobian function, which returns an array of shape
+                (N, n_objective, dim). Defaults to None.
+            hess_batch (Callable, optional): the batched Hessian function, which returns an array of shape
+                (N, n_objective, dim, dim). Defaults to None.
         """
         self.ref = np.concatenate([v for v in ref.values()], axis=0) if isinstance(ref, dict) else ref
         self.p = p
         self.func = func
         self.jac = jac
         self.hess = hess
+        self.func_batch = func_batch
+        self.jac_batch = jac_batch
+        self.hess_batch = hess_batch
 
     def _compute_indices(self, Y: np.ndarray):
         # find for each approximation point, the index of its closest point in the reference set
@@ -50,7 +65,7 @@ class GenerationalDistance:
         """
         if Y is None:
             assert X is not None
-            Y = np.array([self.func(x) for x in X])
+            Y = evaluate_batch(self.func, X, self.func_batch)
         self._compute_indices(Y)
         return np.mean(self.D[np.arange(len(Y)), self.indices] ** self.p) ** (1 / self.p)
 
@@ -78,12 +93,12 @@ class GenerationalDistance:
         c1 = self.p / N
 
         if Y is None:
-            Y = np.array([self.func(x) for x in X])
+            Y = evaluate_batch(self.func, X, self.func_batch)
 
         self._compute_indices(Y)
         # Jacobian of the objective function
         if Jacobian is None:
-            J = np.array([self.jac(x) for x in X])  # (N, n_obj, dim)
+            J = evaluate_batch(self.jac, X, self.jac_batch)  # (N, n_obj, dim)
         else:
             J = Jacobian
         # J = np.array([self.jac(x) for x in X])  # (N, n_objective, dim)
@@ -94,7 +109,7 @@ class GenerationalDistance:
 
         if compute_hessian:
             c2 = self.p * (self.p - 2) / N
-            H = np.array([self.hess(x) for x in X])  # (N, n_objective, dim, dim)
+            H = evaluate_batch(self.hess, X, self.hess_batch)  # (N, n_objective, dim, dim)
             idx = diff_norm != 0
             # some `diff` can be zero
             diff_norm_ = np.zeros(diff_norm.shape)
@@ -209,6 +224,9 @@ class InvertedGenerationalDistance:
         hess: Callable = None,
         p: float = 2,
         cluster_matching: bool = False,
+        func_batch: Callable = None,
+        jac_batch: Callable = None,
+        hess_batch: Callable = None,
     ):
         """Generational Distance
 
@@ -218,12 +236,22 @@ class InvertedGenerationalDistance:
             jac (Callable): the Jacobian function, which returns an array of shape (n_objective, dim)
             hess (Callable): the Hessian function, which returns an array of shape (n_objective, dim, dim)
             p (float, optional): parameter in the p-norm. Defaults to 2.
+            func_batch (Callable, optional): the batched objective function, which takes decision points of
+                shape (N, dim) and returns an array of shape (N, n_objective); it is preferred over `func`.
+                Defaults to None.
+            jac_batch (Callable, optional): the batched Jacobian function, which returns an array of shape
+                (N, n_objective, dim). Defaults to None.
+            hess_batch (Callable, optional): the batched Hessian function, which returns an array of shape
+                (N, n_objective, dim, dim). Defaults to None.
         """
         self.ref = ReferenceSet(ref, p)
         self.p = p
         self.func = func
         self.jac = jac
         self.hess = hess
+        self.func_batch = func_batch
+        self.jac_batch = jac_batch
+        self.hess_batch = hess_batch
         self.M = self.ref.N
         self.cluster_matching = cluster_matching
         self.re_match = True
@@ -289,8 +317,8 @@ class InvertedGenerationalDistance:
         """
         if Y is None:
             assert X is not None
-            assert self.func is not None
-            Y = np.array([self.func(x) for x in X])
+            assert self.func is not None or self.func_batch is not None
+            Y = evaluate_batch(self.func, X, self.func_batch)
         if self.cluster_matching:
             self._match(Y, Y_label)
             return np.mean(np.sum((Y - self._medoids) ** 2, axis=1))
@@ -318,17 +346,17 @@ class InvertedGenerationalDistance:
                 if `compute_hessian` = True, it returns (gradient, Hessian)
                 otherwise, it returns (gradient, )
         """
-        assert self.jac is not None
-        assert self.hess is not None
+        assert self.jac is not None or self.jac_batch is not None
+        assert self.hess is not None or self.hess_batch is not None
         # TODO: implement p != 2
         # NOTE: for the matching method, `self.M = 1` since it is one-to-one matching
         c = 2 if self.cluster_matching else 2 / self.M
         dim = X.shape[1]
         if Y is None:
-            Y = np.array([self.func(x) for x in X])
+            Y = evaluate_batch(self.func, X, self.func_batch)
         # Jacobian of the objective function
         if Jacobian is None:
-            J = np.array([self.jac(x) for x in X])  # (N, n_obj, dim)
+            J = evaluate_batch(self.jac, X, self.jac_batch)  # (N, n_obj, dim)
         else:
             J = Jacobian
         if self.cluster_matching:
@@ -341,7 +369,7 @@ class InvertedGenerationalDistance:
 
         grad = c * np.einsum("ijk,ij->ik", J, diff)  # (N, dim)
         if compute_hessian:
-            H = np.array([self.hess(x) for x in X])  # (N, n_obj, dim, dim)
+            H = evaluate_batch(self.hess, X, self.hess_batch)  # (N, n_obj, dim, dim)
             m = np.tile(self.m[..., np.newaxis], (1, dim, dim)) if not self.cluster_matching else 1
             hessian = c * (
                 m * np.einsum("ijk,ijl->ikl", J, J) + np.einsum("ijkl,ij->ikl", H, diff)
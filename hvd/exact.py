@@ -4,6 +4,8 @@ import subprocess
 import numpy as np
 from pymoo.indicators.hv import hvc_looped
 
+from .hypervolume import hypervolume_contributions
+
 path = "/Users/wangronin/code_base/HypervolumeDerivatives/hv"
 
 
@@ -20,6 +22,10 @@ def hvc_exact_loopwise(ref_point, F):
     return hvc_looped(ref_point, F, hv_exact)
 
 
+def hvc_exact(ref_point, F):
+    return hypervolume_contributions(F, ref_point)
+
+
 class DynamicHypervolume:
     def __init__(self, ref_point, F=None, func_hv=None, func_hvc=None) -> None:
         super().__init__()
@@ -71,5 +77,5 @@ class DynamicHypervolume:
 
 
 class ExactHypervolume(DynamicHypervolume):
-    def __init__(self, ref_point, func_hv=hv_exact, func_hvc=hvc_exact_loopwise, **kwargs) -> None:
+    def __init__(self, ref_point, func_hv=hv_exact, func_hvc=hvc_exact, **kwargs) -> None:
         super().__init__(ref_point, func_hv=func_hv, func_hvc=func_hvc, **kwargs)
@@ -37,19 +37,865 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Tuple, Union
+
 import numpy as np
+from joblib import Parallel, cpu_count, delayed
+from scipy.stats import qmc
+
+try:
+    from numba import jit
+except ImportError:  # see `_auto_engine` for the algorithms used instead
+    jit = None
 
 __author__ = "Simon Wessing"
 
+# "auto": the algorithm given by `_auto_engine`;
+# "python": the pure-Python recursion; "numba": the compiled recursion; "wfg": the compiled WFG algorithm
+ENGINES = ("auto", "python", "numba", "wfg")
+# the sampling methods of `hypervolume_mc`
+SAMPLING_METHODS = ("sobol", "halton", "random")
+
 
-def hypervolume(pointset, ref):
+def hypervolume(pointset, ref, engine: str = "auto"):
     """Compute the absolute hypervolume of a *pointset* according to the
     reference point *ref*.
     """
-    hv = HyperVolume(ref)
+    hv = HyperVolume(ref, engine=engine)
     return hv.compute(pointset)
 
 
+def hypervolume_batch(
+    fronts: Union[np.ndarray, List[np.ndarray]],
+    ref: Union[np.ndarray, List],
+    n_jobs: int = 1,
+    engine: str = "auto",
+) -> np.ndarray:
+    """Compute the hypervolume of many fronts w.r.t. the same reference point
+
+    The points outside of the reference box are dropped for all fronts at once and each front is
+    reduced to its non-dominated subset before the fronts are dispatched, in chunks of roughly equal
+    numbers of points, to a pool of `n_jobs` worker processes.
+
+    Args:
+        fronts (Union[np.ndarray, List[np.ndarray]]): a list (or ragged array) of fronts of shape
+            (n_points, n_objectives), or an array of shape (n_fronts, n_points, n_objectives)
+        ref (Union[np.ndarray, List]): the reference point of shape (n_objectives, )
+        n_jobs (int, optional): the number of worker processes; -1 uses all CPUs. Defaults to 1.
+        engine (str, optional): the engine of `hypervolume`. Defaults to "auto".
+
+    Returns:
+        np.ndarray: the hypervolume values of shape (n_fronts, ), in the order of `fronts`
+    """
+    ref = np.asarray(ref, dtype=float)
+    fronts = [np.asarray(F, dtype=float).reshape(-1, len(ref)) for F in fronts]
+    if len(fronts) == 0:
+        return np.zeros(0)
+    sizes = np.array([len(F) for F in fronts])
+    relevant = np.all(np.concatenate(fronts) <= ref, axis=1)
+    fronts = _non_dominated_batch([F[mask] for F, mask in zip(fronts, np.split(relevant, np.cumsum(sizes)[:-1]))])
+    if n_jobs == 1:
+        return np.array(_hypervolume_chunk(fronts, ref, engine), dtype=float)
+    # the largest fronts go first and each chunk receives the next one as long as it has the fewest points
+    n_chunks = min(len(fronts), 4 * (n_jobs if n_jobs > 0 else cpu_count()))
+    chunks, load = [[] for _ in range(n_chunks)], np.zeros(n_chunks)
+    for i in np.argsort([-len(F) for F in fronts], kind="stable"):
+        k = load.argmin()
+        chunks[k].append(i)
+        load[k] += len(fronts[i]) + 1
+    values = Parallel(n_jobs=n_jobs)(delayed(_hypervolume_chunk)([fronts[i] for i in c], ref, engine) for c in chunks)
+    out = np.zeros(len(fronts))
+    for c, v in zip(chunks, values):
+        out[c] = v
+    return out
+
+
+def _hypervolume_chunk(fronts: List[np.ndarray], ref: np.ndarray, engine: str) -> List[float]:
+    return [hypervolume(F, ref, engine=engine) for F in fronts]
+
+
+def hypervolume_mc(
+    front: Union[np.ndarray, List[List]],
+    ref: Union[np.ndarray, List],
+    n_samples: int = 2**16,
+    method: str = "sobol",
+    n_replicates: int = 8,
+    chunk_size: int = 10**7,
+    seed: Union[int, np.random.Generator] = None,
+) -> Tuple[float, float]:
+    """Estimate the hypervolume by (quasi-)Monte Carlo sampling of the box spanned by the ideal point
+    of `front` and `ref`
+
+    The samples are split into `n_replicates` independent replicates, i.e., randomly scrambled
+    low-discrepancy sequences for "sobol" and "halton", whose estimates are averaged, and the
+    standard error is estimated from their spread. The cost is linear in `n_samples` and in the
+    number of points, and the standard error decreases as `n_samples ** -0.5` for "random" sampling
+    and faster for the low-discrepancy sequences. The samples are drawn and compared in chunks of at
+    most `chunk_size` elements.
+
+    Args:
+        front (Union[np.ndarray, List[List]]): the points of shape (n_points, n_objectives)
+        ref (Union[np.ndarray, List]): the reference point of shape (n_objectives, )
+        n_samples (int, optional): the number of samples, which is rounded up such that each replicate
+            has a power of two samples for "sobol". Defaults to 2**16.
+        method (str, optional): one of `SAMPLING_METHODS`. Defaults to "sobol".
+        n_replicates (int, optional): the number of independent replicates. Defaults to 8.
+        chunk_size (int, optional): the maximal number of elements compared at once. Defaults to 10**7.
+        seed (Union[int, np.random.Generator], optional): the random seed. Defaults to None.
+
+    Returns:
+        Tuple[float, float]: the estimated hypervolume and its standard error
+    """
+    if method not in SAMPLING_METHODS:
+        raise ValueError(f"unknown sampling method {method}; expected one of {SAMPLING_METHODS}")
+    ref = np.asarray(ref, dtype=float)
+    dim = len(ref)
+    points = _relevant_points(np.asarray(front, dtype=float).reshape(-1, dim), ref)
+    if len(points) > 1:
+        points = _non_dominated(points)
+    if len(points) == 0:
+        return 0.0, 0.0
+    rng = np.random.default_rng(seed)
+    lower = points.min(axis=0)
+    volume = np.prod(ref - lower)
+    n_replicates = max(2, int(n_replicates))
+    n = max(1, int(np.ceil(n_samples / n_replicates)))
+    chunk = max(1, chunk_size // (len(points) * dim))
+    if method == "sobol":
+        # the balance properties of Sobol' points require powers of two
+        n, chunk = 2 ** int(np.ceil(np.log2(n))), 2 ** int(np.log2(chunk))
+    estimates = np.zeros(n_replicates)
+    for r in range(n_replicates):
+        if method == "sobol":
+            engine = qmc.Sobol(dim, scramble=True, seed=rng)
+        elif method == "halton":
+            engine = qmc.Halton(dim, scramble=True, seed=rng)
+        count = 0
+        for start in range(0, n, chunk):
+            m = min(chunk, n - start)
+            U = rng.random((m, dim)) if method == "random" else engine.random(m)
+            samples = lower + U * (ref - lower)
+            count += np.count_nonzero(np.any(np.all(points[None, :, :] <= samples[:, None, :], axis=2), axis=1))
+        estimates[r] = volume * count / n
+    return float(estimates.mean()), float(estimates.std(ddof=1) / np.sqrt(n_replicates))
+
+
+def _relevant_points(points: np.ndarray, ref: np.ndarray) -> np.ndarray:
+    """keep only the points that weakly dominate the reference point"""
+    return points[np.all(points <= ref, axis=1)]
+
+
+def hypervolume_2d(pointset: Union[np.ndarray, List[List]], ref: Union[np.ndarray, List]) -> float:
+    """Compute the 2D hypervolume in O(n log n): sort the points on the first objective and sweep
+    the staircase, filtering the dominated points with a cumulative minimum of the second objective
+
+    Args:
+        pointset (Union[np.ndarray, List[List]]): the points of shape (n_points, 2)
+        ref (Union[np.ndarray, List]): the reference point of shape (2, )
+
+    Returns:
+        float: the hypervolume indicator value
+    """
+    ref = np.asarray(ref, dtype=float)
+    points = _relevant_points(np.asarray(pointset, dtype=float).reshape(-1, 2), ref)
+    if len(points) == 0:
+        return 0.0
+    points = points[np.lexsort((points[:, 1], points[:, 0]))]
+    y1, y2 = points[:, 0], points[:, 1]
+    # a point is non-dominated iff its second objective is strictly smaller than all previous ones
+    mask = np.r_[True, y2[1:] < np.minimum.accumulate(y2)[:-1]]
+    y1, y2 = y1[mask], y2[mask]
+    return float(np.sum((np.r_[y1[1:], ref[0]] - y1) * (ref[1] - y2)))
+
+
+def hypervolume_3d(pointset: Union[np.ndarray, List[List]], ref: Union[np.ndarray, List]) -> float:
+    """Compute the 3D hypervolume in O(n log n) with the dimension-sweep algorithm of
+    N. Beume, C. M. Fonseca, M. Lopez-Ibanez, L. Paquete, and J. Vahrenhold. On the complexity of
+    computing the hypervolume indicator. IEEE Transactions on Evolutionary Computation, 13(5), 2009.
+
+    The points are swept in increasing order of the third objective while the dominated area of
+    their projections onto the first two objectives is maintained in a sorted staircase.
+
+    Args:
+        pointset (Union[np.ndarray, List[List]]): the points of shape (n_points, 3)
+        ref (Union[np.ndarray, List]): the reference point of shape (3, )
+
+    Returns:
+        float: the hypervolume indicator value
+    """
+    ref = np.asarray(ref, dtype=float)
+    points = _relevant_points(np.asarray(pointset, dtype=float).reshape(-1, 3), ref)
+    if len(points) == 0:
+        return 0.0
+    points = points[np.argsort(points[:, 2], kind="stable")]
+    staircase = _Staircase(ref[0], ref[1])
+    hvol, z_prev = 0.0, points[0, 2]
+    for x, y, z in points.tolist():
+        hvol += staircase.area * (z - z_prev)
+        staircase.insert(x, y)
+        z_prev = z
+    return hvol + staircase.area * (ref[2] - z_prev)
+
+
+def hypervolume_gradient_3d(pointset: Union[np.ndarray, List[List]], ref: Union[np.ndarray, List]) -> np.ndarray:
+    """Compute the gradient of the 3D hypervolume w.r.t. all points in one sweep per axis
+
+    The partial derivative w.r.t. the `k`-th objective of a point is minus the area of the facet of its
+    box orthogonal to axis `k` that is not dominated by the points which are better in that objective,
+    i.e., its 2D hypervolume improvement in the projection. Sweeping along each axis, the improvement
+    of each point is queried from the staircase of the projections of the points swept before, into
+    which the point is inserted afterwards, taking O(n log n) time per axis.
+
+    Args:
+        pointset (Union[np.ndarray, List[List]]): the points of shape (n_points, 3)
+        ref (Union[np.ndarray, List]): the reference point of shape (3, )
+
+    Returns:
+        np.ndarray: the gradient of shape (n_points, 3)
+    """
+    ref = np.asarray(ref, dtype=float)
+    points = np.asarray(pointset, dtype=float).reshape(-1, 3)
+    grad = np.zeros_like(points)
+    for k in range(3):
+        axes = [a for a in range(3) if a != k]
+        projection = points[:, axes]
+        inside = np.all(projection < ref[axes], axis=1)
+        staircase = _Staircase(*ref[axes])
+        order = np.argsort(points[:, k], kind="stable")
+        # the points tied along axis `k` do not shade each other
+        bounds = np.r_[0, np.nonzero(np.diff(points[order, k]))[0] + 1, len(order)]
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            group = [i for i in order[start:stop] if inside[i]]
+            for i in group:
+                grad[i, k] = -staircase.improvement(*projection[i])
+            for i in group:
+                staircase.insert(*projection[i])
+    return grad
+
+
+def hypervolume_4d(pointset: Union[np.ndarray, List[List]], ref: Union[np.ndarray, List]) -> float:
+    """Compute the 4D hypervolume by a dimension sweep along the fourth objective in the spirit of HV4D of
+    A. P. Guerreiro, C. M. Fonseca, and M. T. M. Emmerich. A fast dimension-sweep algorithm for the
+    hypervolume indicator in four dimensions. CCCG, 2012.
+
+    The non-dominated 3D projections of the points swept so far are kept sorted by the third objective
+    across the slices, together with the 3D volume they dominate. This volume grows by the exclusive 3D
+    contribution of each new point, which is computed in one sweep of the front along the third objective,
+    clipping the front to the box of the new point in a `_Staircase`. Hence, each point takes O(n)
+    updates of the staircase (of a binary search each) and of the front, i.e., O(n^2) updates in total.
+
+    Args:
+        pointset (Union[np.ndarray, List[List]]): the points of shape (n_points, 4)
+        ref (Union[np.ndarray, List]): the reference point of shape (4, )
+
+    Returns:
+        float: the hypervolume indicator value
+    """
+    ref = np.asarray(ref, dtype=float)
+    points = _relevant_points(np.asarray(pointset, dtype=float).reshape(-1, 4), ref)
+    if len(points) == 0:
+        return 0.0
+    points = points[np.argsort(points[:, 3], kind="stable")]
+    r1, r2, r3, r4 = ref.tolist()
+    # the non-dominated 3D projections of the points swept so far as (z, x, y), in increasing order of z
+    front: List[Tuple[float, float, float]] = []
+    hvol, volume, w_prev = 0.0, 0.0, points[0, 3]
+    for x, y, z, w in points.tolist():
+        hvol += volume * (w - w_prev)
+        w_prev = w
+        contribution = _contribution_4d_slice(x, y, z, front, r1, r2, r3)
+        if contribution is None:  # weakly dominated in the projection
+            continue
+        volume += contribution
+        front = [q for q in front if not (x <= q[1] and y <= q[2] and z <= q[0])]
+        insort(front, (z, x, y))
+    return hvol + volume * (r4 - w_prev)
+
+
+def _contribution_4d_slice(
+    x: float, y: float, z: float, front: List[Tuple[float, float, float]], r1: float, r2: float, r3: float
+) -> Union[float, None]:
+    """The exclusive 3D contribution of (x, y, z) w.r.t. `front`, sorted as in `hypervolume_4d`, or None if
+    the point is weakly dominated by the front"""
+    staircase = _Staircase(r1, r2)
+    box = (r1 - x) * (r2 - y)
+    # the points below `z` clip the base of the box of the point
+    k = 0
+    while k < len(front) and front[k][0] <= z:
+        _, qx, qy = front[k]
+        staircase.insert(max(qx, x), max(qy, y))
+        k += 1
+    if staircase.is_dominated(x, y):
+        return None
+    contribution, z_prev = 0.0, z
+    for qz, qx, qy in front[k:]:
+        contribution += (box - staircase.area) * (qz - z_prev)
+        staircase.insert(max(qx, x), max(qy, y))
+        z_prev = qz
+        if staircase.is_dominated(x, y):  # the rest of the box is covered
+            return contribution
+    return contribution + (box - staircase.area) * (r3 - z_prev)
+
+
+def hypervolume_wfg(pointset: Union[np.ndarray, List[List]], ref: Union[np.ndarray, List]) -> float:
+    """Compute the hypervolume with the WFG algorithm of
+    L. While, L. Bradstreet, and L. Barone. A fast way of calculating exact hypervolumes.
+    IEEE Transactions on Evolutionary Computation, 16(1), 2012.
+
+    The points are sorted in decreasing order of the last objective, such that the limit set of each
+    point w.r.t. the following ones lies in the slice above it and the last objective is dropped in
+    the recursion. The limit sets are reduced to their non-dominated subsets, and a point whose
+    projection is weakly dominated by a following one is skipped without computing its limit set.
+    The recursion ends at the 2D sweep and runs as a compiled kernel if `numba` is available.
+
+    Args:
+        pointset (Union[np.ndarray, List[List]]): the points of shape (n_points, n_objectives)
+        ref (Union[np.ndarray, List]): the reference point of shape (n_objectives, )
+
+    Returns:
+        float: the hypervolume indicator value
+    """
+    ref = np.asarray(ref, dtype=float)
+    points = _non_dominated(_relevant_points(np.asarray(pointset, dtype=float).reshape(-1, len(ref)), ref))
+    return float(_wfgKernel(np.ascontiguousarray(points), ref))
+
+
+# the algorithms dispatched by `engine`, besides the recursions
+_ALGORITHMS = {"2d": hypervolume_2d, "3d": hypervolume_3d, "4d": hypervolume_4d, "wfg": hypervolume_wfg}
+
+
+def _auto_engine(dim: int) -> str:
+    """The algorithm of `engine="auto"` for a numerical front with `dim` objectives:
+
+    | objectives | with `numba` | without `numba` |
+    | ---------- | ------------ | --------------- |
+    | 1          | "python"     | "python"        |
+    | 2          | "2d"         | "2d"            |
+    | 3          | "3d"         | "3d"            |
+    | 4          | "numba"      | "4d"            |
+    | >= 5       | "wfg"        | "python"        |
+
+    where "2d", "3d" and "4d" are the sweeps `hypervolume_2d`, `hypervolume_3d` and
+    `hypervolume_4d`, "wfg" is `hypervolume_wfg`, and "numba" and "python" are the compiled
+    and the pure-Python recursion.
+    """
+    if dim in (2, 3):
+        return f"{dim}d"
+    if dim < 2:
+        return "python"
+    if jit is not None:
+        return "numba" if dim == 4 else "wfg"
+    return "4d" if dim == 4 else "python"
+
+
+def hypervolume_contributions(front: Union[np.ndarray, List[List]], ref: Union[np.ndarray, List]) -> np.ndarray:
+    """Compute the exclusive hypervolume contribution of every point of `front` in a single pass
+
+    In 2D, the contribution of a point on the staircase is the rectangle spanned with its neighbours
+    minus the area of the dominated points lying in it. In 3D, the points are swept in increasing
+    order of the last objective while keeping, for each point on the 2D staircase of the swept
+    points, its exclusive rectangle and the staircase of the points covering it, following
+    M. T. M. Emmerich and C. M. Fonseca. Computing hypervolume contributions in low dimensions:
+    asymptotically optimal algorithm and complexity results. EMO 2011.
+    Both run in O(n log n). For more objectives, the contribution of each point is the volume of its
+    box minus the hypervolume of its limit set.
+
+    Dominated points, duplicated points and points which do not dominate `ref` contribute zero.
+
+    Args:
+        front (Union[np.ndarray, List[List]]): the points of shape (n_points, n_objectives)
+        ref (Union[np.ndarray, List]): the reference point of shape (n_objectives, )
+
+    Returns:
+        np.ndarray: the exclusive contributions of shape (n_points, )
+    """
+    ref = np.asarray(ref, dtype=float)
+    F = np.asarray(front, dtype=float).reshape(-1, len(ref))
+    hvc = np.zeros(len(F))
+    # the boxes of points on the boundary of the reference box are empty
+    relevant = np.nonzero(np.all(F < ref, axis=1))[0]
+    if len(relevant) == 0:
+        return hvc
+    points, index, counts = np.unique(F[relevant], axis=0, return_inverse=True, return_counts=True)
+    contributions = {2: _contributions_2d, 3: _contributions_3d}.get(len(ref), _contributions_limit_sets)(points, ref)
+    contributions[counts > 1] = 0.0
+    hvc[relevant] = contributions[index.reshape(-1)]
+    return hvc
+
+
+def _contributions_2d(points: np.ndarray, ref: np.ndarray) -> np.ndarray:
+    hvc = np.zeros(len(points))
+    order = np.lexsort((points[:, 1], points[:, 0]))
+    P = points[order]
+    # the staircase, on which the second objective decreases strictly
+    on_front = np.r_[True, P[1:, 1] < np.minimum.accumulate(P[:-1, 1])]
+    S, D = P[on_front], P[~on_front]
+    x_next, y_prev = np.r_[S[1:, 0], ref[0]], np.r_[ref[1], S[:-1, 1]]
+    contributions = (x_next - S[:, 0]) * (y_prev - S[:, 1])
+    # a dominated point only shares the rectangle of the last staircase point on its left
+    owner = np.searchsorted(S[:, 0], D[:, 0], side="right") - 1
+    inside = D[:, 1] < y_prev[owner]
+    D, owner = D[inside], owner[inside]
+    idx = np.argsort(owner, kind="stable")
+    D, owner = D[idx], owner[idx]
+    groups, starts = np.unique(owner, return_index=True)
+    for j, covering in zip(groups, np.split(D, starts[1:])):
+        contributions[j] -= hypervolume_2d(covering, [x_next[j], y_prev[j]])
+    hvc[order[on_front]] = contributions
+    return hvc
+
+
+def _contributions_3d(points: np.ndarray, ref: np.ndarray) -> np.ndarray:
+    N = len(points)
+    hvc = np.zeros(N)
+    r1, r2, r3 = ref
+    # the exclusive area of each point on the staircase and the height since which it holds
+    area, since = np.zeros(N), np.zeros(N)
+    # the staircase of the swept points and, for each of them, the points covering its rectangle
+    xs: List[float] = []
+    neg_ys: List[float] = []
+    keys: List[int] = []
+    covers: Dict[int, _Staircase] = {}
+
+    def close(j: int, z: float):
+        key = keys[j]
+        hvc[key] += area[key] * (z - since[key])
+        since[key] = z
+
+    def refresh(j: int):
+        key = keys[j]
+        x_next = xs[j + 1] if j + 1 < len(xs) else r1
+        y_prev = -neg_ys[j - 1] if j > 0 else r2
+        covers[key].clip(x_next, y_prev)
+        area[key] = (x_next - xs[j]) * (y_prev + neg_ys[j]) - covers[key].area
+
+    for key in np.lexsort((points[:, 1], points[:, 0], points[:, 2])):
+        x, y, z = points[key]
+        i = bisect_right(xs, x)
+        if i > 0 and -neg_ys[i - 1] <= y:
+            # `(x, y)` is dominated on the staircase and can only cover the rectangle of the `i - 1`-th point
+            j = i - 1
+            if y < (-neg_ys[j - 1] if j > 0 else r2) and covers[keys[j]].insert(x, y):
+                close(j, z)
+                refresh(j)
+            continue
+        lo = bisect_left(xs, x)
+        hi = bisect_right(neg_ys, -y, lo)
+        # the staircase points dominated by `(x, y)` stop contributing and cover its rectangle
+        cover = _Staircase(xs[hi] if hi < len(xs) else r1, -neg_ys[lo - 1] if lo > 0 else r2)
+        for j in range(lo, hi):
+            close(j, z)
+            area[keys[j]] = 0.0
+            del covers[keys[j]]
+            cover.insert(xs[j], -neg_ys[j])
+        xs[lo:hi], neg_ys[lo:hi], keys[lo:hi] = [x], [-y], [key]
+        covers[key] = cover
+        since[key] = z
+        refresh(lo)
+        # the neighbours' rectangles shrink
+        for j in (lo - 1, lo + 1):
+            if 0 <= j < len(xs):
+                close(j, z)
+                refresh(j)
+    for j in range(len(xs)):
+        close(j, r3)
+    return hvc
+
+
+def _contributions_limit_sets(points: np.ndarray, ref: np.ndarray) -> np.ndarray:
+    return np.array(
+        [np.prod(ref - p) - hypervolume(_limit_set(p, np.delete(points, i, axis=0)), ref) for i, p in enumerate(points)]
+    )
+
+
+def _non_dominated(points: np.ndarray, chunk_size: int = 10**7) -> np.ndarray:
+    """the non-dominated subset of `points`, where only one copy of duplicated points is kept
+
+    The pairwise comparisons are done in row blocks of at most `chunk_size` elements.
+    """
+    if len(points) <= 1:
+        return points
+    points = np.unique(points, axis=0)
+    N, dim = points.shape
+    mask = np.ones(N, dtype=bool)
+    step = max(1, chunk_size // (N * dim))
+    for start in range(0, N, step):
+        block = points[start : start + step]
+        # without duplicates, being weakly dominated by another point means being dominated
+        dominated = np.all(points[None, :, :] <= block[:, None, :], axis=2)
+        dominated[np.arange(len(block)), np.arange(start, start + len(block))] = False
+        mask[start : start + step] = ~np.any(dominated, axis=1)
+    return points[mask]
+
+
+def _non_dominated_batch(fronts: List[np.ndarray], chunk_size: int = 10**7) -> List[np.ndarray]:
+    """the non-dominated subset of each front, where only the first copy of duplicated points is kept
+
+    Fronts of similar sizes are padded to a common size and compared together in blocks of at most
+    `chunk_size` elements, while fronts too large for a block are filtered with `_non_dominated`.
+    """
+    out: List[np.ndarray] = [None] * len(fronts)
+    sizes = np.array([len(F) for F in fronts])
+    dim = fronts[0].shape[1] if fronts else 0
+    order = np.argsort(sizes, kind="stable")
+    start = 0
+    while start < len(order):
+        if sizes[order[start]] ** 2 * dim > chunk_size:
+            for i in order[start:]:
+                out[i] = _non_dominated(fronts[i])
+            break
+        # grow the block while the padded comparisons fit into `chunk_size`
+        stop = start + 1
+        while stop < len(order) and (stop - start + 1) * sizes[order[stop]] ** 2 * dim <= chunk_size:
+            stop += 1
+        block, n = order[start:stop], sizes[order[stop - 1]]
+        if n <= 1:
+            for i in block:
+                out[i] = fronts[i]
+        else:
+            P = np.full((len(block), n, dim), np.inf)
+            for b, i in enumerate(block):
+                P[b, : sizes[i]] = fronts[i]
+            # `leq[b, i, j]`: the j-th point weakly dominates the i-th one
+            leq = np.all(P[:, None, :, :] <= P[:, :, None, :], axis=3)
+            equal = leq & np.swapaxes(leq, 1, 2)
+            dominated = np.any((leq & ~equal) | np.tril(equal, k=-1), axis=2)
+            for b, i in enumerate(block):
+                out[i] = fronts[i][~dominated[b, : sizes[i]]]
+        start = stop
+    return out
+
+
+def _limit_set(point: np.ndarray, front: np.ndarray) -> np.ndarray:
+    """The points of `front` clipped to the box dominated by `point`, such that the exclusive
+    contribution of `point` is the volume of its box minus the hypervolume of the limit set"""
+    return np.maximum(front, point)
+
+
+class _Staircase:
+    """The non-dominated set of 2D points kept sorted in increasing order of the first objective
+    (hence decreasing order of the second one), together with the area it dominates"""
+
+    def __init__(self, r1: float, r2: float):
+        self.r1, self.r2 = float(r1), float(r2)
+        self.xs: List[float] = []
+        # negated second objective such that both lists are sorted increasingly
+        self.neg_ys: List[float] = []
+        self.area: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def is_dominated(self, x: float, y: float) -> bool:
+        """whether (x, y) is weakly dominated by the staircase"""
+        i = bisect_right(self.xs, x)
+        return i > 0 and -self.neg_ys[i - 1] <= y
+
+    def insert(self, x: float, y: float) -> bool:
+        """insert (x, y), remove the points it dominates and update the area
+
+        Returns:
+            bool: whether the point is inserted, i.e., it is not weakly dominated
+        """
+        if self.is_dominated(x, y):
+            return False
+        delta, lo, hi = self._delta(x, y)
+        self.area += delta
+        self.xs[lo:hi] = [x]
+        self.neg_ys[lo:hi] = [-y]
+        return True
+
+    def improvement(self, x: float, y: float) -> float:
+        """the area dominated by (x, y) but not by the staircase"""
+        return 0.0 if self.is_dominated(x, y) else self._delta(x, y)[0]
+
+    def _delta(self, x: float, y: float) -> Tuple[float, int, int]:
+        xs, neg_ys = self.xs, self.neg_ys
+        lo = bisect_left(xs, x)
+        # points in `[lo, hi)` are (weakly) dominated by the new point
+        hi = bisect_right(neg_ys, -y, lo)
+        x_hi = xs[hi] if hi < len(xs) else self.r1
+        delta = (x_hi - x) * (self.r2 - y)
+        for j in range(lo, hi):
+            delta -= ((xs[j + 1] if j + 1 < len(xs) else self.r1) - xs[j]) * (self.r2 + neg_ys[j])
+        if lo > 0:
+            delta -= ((xs[lo] if lo < len(xs) else self.r1) - x) * (self.r2 + neg_ys[lo - 1])
+        return delta, lo, hi
+
+    def clip(self, r1: float, r2: float):
+        """shrink the reference point to `(r1, r2)`, dropping the points which no longer dominate it"""
+        xs, neg_ys = self.xs, self.neg_ys
+        # drop the points from the right, the area left of each dropped point is merged into its predecessor
+        while xs and xs[-1] >= r1:
+            x = xs.pop()
+            y = -neg_ys.pop()
+            self.area -= (self.r1 - x) * (self.r2 - y)
+            if xs:
+                self.area += (self.r1 - x) * (self.r2 + neg_ys[-1])
+        if xs:
+            self.area -= (self.r1 - r1) * (self.r2 + neg_ys[-1])
+        self.r1 = float(r1)
+        # drop the points from the top
+        k = bisect_right(neg_ys, -r2)
+        for j in range(k):
+            self.area -= ((xs[j + 1] if j + 1 < len(xs) else self.r1) - xs[j]) * (self.r2 + neg_ys[j])
+        del xs[:k], neg_ys[:k]
+        if xs:
+            self.area -= (self.r2 - r2) * (self.r1 - xs[0])
+        else:
+            self.area = 0.0
+        self.r2 = float(r2)
+
+
+class DynamicHypervolume2D:
+    """Hypervolume and exclusive contributions of a 2D point set under insertion, deletion and move
+
+    The non-dominated points are kept in a staircase sorted by the first objective, such that an update
+    only changes the hypervolume by the exclusive contribution of the updated point and only changes
+    the contributions of its two neighbours. Dominated points are kept aside, sorted by the first
+    objective, since they reduce the contributions of the points dominating them, and are restored to
+    the staircase when those are deleted. The dominated points covering the box of a staircase point
+    lie in a range of the first objective, which is found by bisection, such that an update takes
+    O(log n + k log k) time for the k dominated points in the boxes of the updated point and its
+    neighbours, besides shifting the sorted lists.
+
+    It follows the interface of `pymoo`'s `DynamicHypervolume`: `F`, `hv` and `hvc` are the points,
+    the hypervolume and the exclusive contributions, where the latter two are aligned with the rows of
+    `F`, which is assembled on access.
+    """
+
+    def __init__(self, ref_point: Union[np.ndarray, List], F: np.ndarray = None):
+        self.ref_point = np.asarray(ref_point, dtype=float)
+        assert len(self.ref_point) == 2
+        self.hv: float = 0.0
+        self._r1, self._r2 = self.ref_point
+        self._count = 0  # the next key
+        self._keys: List[int] = []  # the keys of the points in the order of insertion
+        self._points: Dict[int, Tuple[float, float]] = {}
+        self._hvc: Dict[int, float] = {}
+        # the staircase of distinct non-dominated points with the keys of all their copies
+        self._xs: List[float] = []
+        self._ys: List[float] = []
+        self._copies: List[List[int]] = []
+        # the dominated points as `(x, y, key)`, sorted increasingly
+        self._dominated: List[Tuple[float, float, int]] = []
+        if F is not None:
+            self.add(F)
+
+    @property
+    def F(self) -> np.ndarray:
+        return np.array([self._points[k] for k in self._keys], dtype=float).reshape(-1, 2)
+
+    @property
+    def hvc(self) -> np.ndarray:
+        return np.fromiter(map(self._hvc.__getitem__, self._keys), dtype=float, count=len(self._keys))
+
+    def add(self, F: np.ndarray) -> "DynamicHypervolume2D":
+        for y in np.atleast_2d(F):
+            self._insert(y, len(self._keys))
+        return self
+
+    def delete(self, k: int) -> "DynamicHypervolume2D":
+        self._remove(self._keys.pop(k))
+        return self
+
+    def move(self, k: int, y: np.ndarray) -> "DynamicHypervolume2D":
+        """replace the `k`-th point by `y`"""
+        self.delete(k)
+        self._insert(y, k)
+        return self
+
+    def _insert(self, y: np.ndarray, position: int):
+        key = self._count
+        self._count += 1
+        self._keys.insert(position, key)
+        self._points[key] = (float(y[0]), float(y[1]))
+        self._hvc[key] = 0.0
+        self._add_to_staircase([key])
+
+    def _remove(self, key: int):
+        x, y = self._points.pop(key)
+        del self._hvc[key]
+        i = bisect_left(self._dominated, (x, y, key))
+        if i < len(self._dominated) and self._dominated[i][2] == key:
+            del self._dominated[i]
+            self._update_owner(x)
+            return
+        j = bisect_left(self._xs, x)
+        self._copies[j].remove(key)
+        if self._copies[j]:
+            self._update_contributions(j, j + 1)
+            return
+        # the exclusive contribution of the only copy is lost
+        self.hv -= (self._x(j + 1) - x) * (self._y(j - 1) - y)
+        x_prev = self._xs[j - 1] if j > 0 else -np.inf
+        y_next = self._ys[j + 1] if j + 1 < len(self._ys) else -np.inf
+        x_next, y_prev = self._x(j + 1), self._y(j - 1)
+        del self._xs[j], self._ys[j], self._copies[j]
+        self._update_contributions(j - 1, j + 1)
+        # restore the points which were dominated by the deleted one only
+        lo, hi = bisect_right(self._dominated, (x_prev, np.inf)), bisect_left(self._dominated, (x_next,))
+        freed, kept = [], []
+        for item in self._dominated[lo:hi]:
+            (freed if y_next < item[1] < y_prev else kept).append(item)
+        self._dominated[lo:hi] = kept
+        self._add_to_staircase([k for _, _, k in freed])
+
+    def _add_to_staircase(self, keys: List[int]):
+        r1, r2 = self._r1, self._r2
+        xs, ys, copies = self._xs, self._ys, self._copies
+        for key in keys:
+            x, y = self._points[key]
+            if x > r1 or y > r2:
+                insort(self._dominated, (x, y, key))
+                continue
+            i = bisect_right(xs, x)
+            if i > 0 and xs[i - 1] == x and ys[i - 1] == y:
+                copies[i - 1].append(key)
+                self._update_contributions(i - 1, i)
+                continue
+            if i > 0 and ys[i - 1] <= y:
+                insort(self._dominated, (x, y, key))
+                self._update_owner(x)
+                continue
+            lo = bisect_left(xs, x)
+            # the staircase points in `[lo, hi)` are weakly dominated by the new point
+            hi = lo
+            while hi < len(xs) and ys[hi] >= y:
+                hi += 1
+            x_hi = self._x(hi)
+            delta = (x_hi - x) * (r2 - y)
+            for j in range(lo, hi):
+                delta -= (self._x(j + 1) - xs[j]) * (r2 - ys[j])
+            if lo > 0:
+                delta -= (self._x(lo) - x) * (r2 - ys[lo - 1])
+            self.hv += delta
+            for j in range(lo, hi):
+                for k in copies[j]:
+                    self._hvc[k] = 0.0
+                    insort(self._dominated, (xs[j], ys[j], k))
+            xs[lo:hi], ys[lo:hi], copies[lo:hi] = [x], [y], [[key]]
+            self._update_contributions(lo - 1, lo + 2)
+
+    def _update_owner(self, x: float):
+        """update the contribution of the staircase point whose box contains a dominated point at `x`"""
+        j = bisect_right(self._xs, x) - 1
+        self._update_contributions(j, j + 1)
+
+    def _update_contributions(self, start: int, stop: int):
+        """recompute the exclusive contributions of the staircase points in `[start, stop)`"""
+        for j in range(max(start, 0), min(stop, len(self._xs))):
+            keys = self._copies[j]
+            hvc = 0.0
+            if len(keys) == 1:
+                x_next, y_prev = self._x(j + 1), self._y(j - 1)
+                hvc = (x_next - self._xs[j]) * (y_prev - self._ys[j])
+                # the dominated points in the box between the neighbours cover a part of it
+                lo = bisect_left(self._dominated, (self._xs[j],))
+                hi = bisect_left(self._dominated, (x_next,), lo)
+                if hi > lo:
+                    pool = np.array([item[:2] for item in self._dominated[lo:hi]])
+                    hvc -= hypervolume_2d(pool, [x_next, y_prev])
+            for k in keys:
+                self._hvc[k] = hvc
+
+    def _x(self, j: int) -> float:
+        return self._xs[j] if j < len(self._xs) else self._r1
+
+    def _y(self, j: int) -> float:
+        return self._ys[j] if j >= 0 else self._r2
+
+
+class LimitSetHypervolume3D:
+    """Hypervolume and exclusive contributions of a point set under insertion, deletion and move, where the
+    contributions of the affected points are recomputed on limit sets
+
+    Inserting (deleting) a point `p` changes the hypervolume by its exclusive contribution and changes
+    the contribution of another point `q` by the exclusive contribution of `max(p, q)` w.r.t. the other
+    points. Only the points for which `max(p, q)` is not dominated by any other point are updated, each
+    with a hypervolume computation on a limit set. It is meant for three objectives, but the updates
+    hold for any number of objectives.
+
+    No structure is maintained between updates: finding the affected points takes O(n^2) comparisons,
+    which are done in blocks of bounded memory, and each of the `a` affected points takes an O(n log n)
+    hypervolume computation in 3D, hence O(n^2 + a n log n) time per update. Unlike `DynamicHypervolume2D`,
+    this is only cheaper than recomputing all contributions when few points are affected.
+
+    It follows the interface of `pymoo`'s `DynamicHypervolume`: `F`, `hv` and `hvc` are the points,
+    the hypervolume and the exclusive contributions, where the latter is aligned with the rows of `F`.
+    """
+
+    def __init__(self, ref_point: Union[np.ndarray, List], F: np.ndarray = None):
+        self.ref_point = np.asarray(ref_point, dtype=float)
+        self.n_dim = len(self.ref_point)
+        self.F = np.zeros((0, self.n_dim))
+        self.hv: float = 0.0
+        self.hvc = np.zeros(0)
+        if F is not None:
+            self.add(F)
+
+    def add(self, F: np.ndarray) -> "LimitSetHypervolume3D":
+        F = np.atleast_2d(np.asarray(F, dtype=float))
+        if len(F) == 1:
+            self._insert(F[0], len(self.F))
+        else:  # it is cheaper to recompute everything than to insert many points one by one
+            self.F = np.vstack([self.F, F])
+            self.hv = hypervolume(self.F, self.ref_point)
+            self.hvc = hypervolume_contributions(self.F, self.ref_point)
+        return self
+
+    def delete(self, k: int) -> "LimitSetHypervolume3D":
+        y = self.F[k]
+        self.F = np.delete(self.F, k, axis=0)
+        self.hvc = np.delete(self.hvc, k)
+        self.hv -= self._exclusive(y, self.F)
+        # the points which share the exclusive region of `y` gain that share
+        for q in self._affected(y):
+            self.hvc[q] += self._exclusive(np.maximum(y, self.F[q]), np.delete(self.F, q, axis=0))
+        return self
+
+    def move(self, k: int, y: np.ndarray) -> "LimitSetHypervolume3D":
+        """replace the `k`-th point by `y`"""
+        self.delete(k)
+        self._insert(y, k)
+        return self
+
+    def _insert(self, y: np.ndarray, position: int):
+        y = np.asarray(y, dtype=float)
+        hvc = self._exclusive(y, self.F)
+        self.hv += hvc
+        # the points lose the share of their exclusive region that is dominated by `y`
+        for q in self._affected(y):
+            self.hvc[q] -= self._exclusive(np.maximum(y, self.F[q]), np.delete(self.F, q, axis=0))
+        self.F = np.insert(self.F, position, y, axis=0)
+        self.hvc = np.insert(self.hvc, position, hvc)
+
+    def _affected(self, y: np.ndarray, chunk_size: int = 10**7) -> np.ndarray:
+        """indices of the points `q` such that `max(y, q)` is not weakly dominated by another point
+
+        The pairwise comparisons are done in row blocks of at most `chunk_size` elements.
+        """
+        if len(self.F) == 0:
+            return np.array([], dtype=int)
+        M = np.maximum(y, self.F)
+        candidates = np.nonzero(np.all(M < self.ref_point, axis=1))[0]
+        mask = np.zeros(len(candidates), dtype=bool)
+        step = max(1, chunk_size // self.F.size)
+        for start in range(0, len(candidates), step):
+            block = candidates[start : start + step]
+            dominated = np.all(self.F[None, :, :] <= M[block, None, :], axis=2)
+            dominated[np.arange(len(block)), block] = False
+            mask[start : start + step] = ~np.any(dominated, axis=1)
+        return candidates[mask]
+
+    def _exclusive(self, y: np.ndarray, F: np.ndarray) -> float:
+        """the exclusive contribution of `y` w.r.t. `F`"""
+        if np.any(y >= self.ref_point):
+            return 0.0
+        return np.prod(self.ref_point - y) - hypervolume(_limit_set(y, F), self.ref_point)
+
+
 class HyperVolume:
     """
     Hypervolume computation based on variant 3 of the algorithm in the paper:
@@ -59,11 +905,20 @@ class HyperVolume:
 
     Minimization is implicitly assumed here!
 
+    The recursion runs either in pure Python or, with `engine="numba"`, as a
+    compiled kernel over the arrays of `MultiList`. See `_auto_engine` for the
+    choice made by `engine="auto"`.
+
     """
 
-    def __init__(self, referencePoint):
+    def __init__(self, referencePoint, engine="auto"):
         """Constructor."""
+        if engine not in ENGINES:
+            raise ValueError(f"`engine` should be one of {ENGINES}, got {engine}")
+        if engine in ("numba", "wfg") and jit is None:
+            raise ImportError(f"`numba` is required for `engine='{engine}'`")
         self.referencePoint = referencePoint
+        self.engine = engine
         self.list = []
 
     def compute(self, front):
@@ -72,28 +927,36 @@ class HyperVolume:
         Before the HV computation, front and reference point are translated, so
         that the reference point is [0, ..., 0].
 
-        """
-
-        def weaklyDominates(point, other):
-            for i in range(len(point)):
-                if point[i] > other[i]:
-                    return False
-            return True
+        The front is dispatched according to `self.engine`.
 
-        relevantPoints = []
+        """
         referencePoint = self.referencePoint
         dimensions = len(referencePoint)
-        for point in front:
-            # only consider points that dominate the reference point
-            if weaklyDominates(point, referencePoint):
-                relevantPoints.append(point)
-        if any(referencePoint):
-            # shift points so that referencePoint == [0, ..., 0]
-            # this way the reference point doesn't have to be explicitly used
-            # in the HV computation
-            for j in range(len(relevantPoints)):
-                relevantPoints[j] = [relevantPoints[j][i] - referencePoint[i] for i in range(dimensions)]
+        ref = np.asarray(referencePoint, dtype=float)
+        points = np.asarray(front, dtype=float).reshape(-1, dimensions)
+        engine = self.engine
+        if engine == "auto":
+            engine = _auto_engine(dimensions)
+        if engine in _ALGORITHMS:
+            return _ALGORITHMS[engine](points, ref)
+        # the recursion expects a non-dominated front, shifted such that the reference point is [0, ..., 0]
+        relevantPoints = _non_dominated(_relevant_points(points, ref)) - ref
         self.preProcess(relevantPoints)
+        if engine == "numba":
+            bounds = np.full(dimensions, -1.0e308)
+            multiList = self.list
+            hyperVolume = _hvRecursiveKernel(
+                dimensions - 1,
+                len(relevantPoints),
+                bounds,
+                multiList.cargo,
+                multiList.next,
+                multiList.prev,
+                multiList.area,
+                multiList.volume,
+                multiList.ignore,
+            )
+            return float(hyperVolume)
         bounds = [-1.0e308] * dimensions
         hyperVolume = self.hvRecursive(dimensions - 1, len(relevantPoints), bounds)
         return hyperVolume
@@ -104,102 +967,114 @@ class HyperVolume:
         In contrast to the paper, the code assumes that the reference point
         is [0, ..., 0]. This allows the avoidance of a few operations.
 
+        Nodes are the integer ids of the array-backed `MultiList`, where 0 is the sentinel,
+        and the links are read through its per-list `columns`.
+
         """
         hvol = 0.0
-        sentinel = self.list.sentinel
+        multiList = self.list
+        cargo, next_, prev, area, volume = multiList.columns
+        ignore = multiList.ignoreColumn
         if length == 0:
             return hvol
         elif dimIndex == 0:
             # special case: only one dimension
             # why using hypervolume at all?
-            return -sentinel.next[0].cargo[0]
+            return -cargo[0][next_[0][0]]
         elif dimIndex == 1:
             # special case: two dimensions, end recursion
-            q = sentinel.next[1]
-            h = q.cargo[0]
-            p = q.next[1]
-            while p is not sentinel:
-                pCargo = p.cargo
-                hvol += h * (q.cargo[1] - pCargo[1])
-                if pCargo[0] < h:
-                    h = pCargo[0]
-                q = p
-                p = q.next[1]
-            hvol += h * q.cargo[1]
+            cargo0, cargo1, next1 = cargo[0], cargo[1], next_[1]
+            q = next1[0]
+            h = cargo0[q]
+            qCargo1 = cargo1[q]
+            p = next1[q]
+            while p != 0:
+                pCargo1 = cargo1[p]
+                hvol += h * (qCargo1 - pCargo1)
+                pCargo0 = cargo0[p]
+                if pCargo0 < h:
+                    h = pCargo0
+                qCargo1 = pCargo1
+                p = next1[p]
+            hvol += h * qCargo1
             return hvol
+        elif dimIndex == 2:
+            # end the recursion with the dimension sweep of `hypervolume_3d` over the third list
+            cargo0, cargo1, cargo2, next2 = cargo[0], cargo[1], cargo[2], next_[2]
+            staircase = _Staircase(0.0, 0.0)
+            p = next2[0]
+            zPrev = cargo2[p]
+            while p != 0:
+                z = cargo2[p]
+                hvol += staircase.area * (z - zPrev)
+                staircase.insert(cargo0[p], cargo1[p])
+                zPrev = z
+                p = next2[p]
+            return hvol - staircase.area * zPrev
         else:
-            remove = self.list.remove
-            reinsert = self.list.reinsert
+            remove = multiList.remove
+            reinsert = multiList.reinsert
             hvRecursive = self.hvRecursive
-            p = sentinel
-            q = p.prev[dimIndex]
-            while q.cargo is not None:
-                if q.ignore < dimIndex:
-                    q.ignore = 0
-                q = q.prev[dimIndex]
-            q = p.prev[dimIndex]
-            while length > 1 and (
-                q.cargo[dimIndex] > bounds[dimIndex] or q.prev[dimIndex].cargo[dimIndex] >= bounds[dimIndex]
-            ):
+            cargoD, nextD, prevD = cargo[dimIndex], next_[dimIndex], prev[dimIndex]
+            areaD, volumeD = area[dimIndex], volume[dimIndex]
+            p = 0
+            q = prevD[p]
+            while q != 0:
+                if ignore[q] < dimIndex:
+                    ignore[q] = 0
+                q = prevD[q]
+            q = prevD[p]
+            while length > 1 and (cargoD[q] > bounds[dimIndex] or cargoD[prevD[q]] >= bounds[dimIndex]):
                 p = q
                 remove(p, dimIndex, bounds)
-                q = p.prev[dimIndex]
+                q = prevD[p]
                 length -= 1
-            qArea = q.area
-            qCargo = q.cargo
-            qPrevDimIndex = q.prev[dimIndex]
+            qPrevDimIndex = prevD[q]
             if length > 1:
-                hvol = qPrevDimIndex.volume[dimIndex] + qPrevDimIndex.area[dimIndex] * (
-                    qCargo[dimIndex] - qPrevDimIndex.cargo[dimIndex]
-                )
+                hvol = volumeD[qPrevDimIndex] + areaD[qPrevDimIndex] * (cargoD[q] - cargoD[qPrevDimIndex])
             else:
-                qArea[0] = 1
-                qArea[1 : dimIndex + 1] = [qArea[i] * -qCargo[i] for i in range(dimIndex)]
-            q.volume[dimIndex] = hvol
-            if q.ignore >= dimIndex:
-                qArea[dimIndex] = qPrevDimIndex.area[dimIndex]
+                area[0][q] = 1
+                qArea = [area[i][q] for i in range(dimIndex)]
+                for i in range(dimIndex):
+                    area[i + 1][q] = qArea[i] * -cargo[i][q]
+            volumeD[q] = hvol
+            if ignore[q] >= dimIndex:
+                areaD[q] = areaD[qPrevDimIndex]
             else:
-                qArea[dimIndex] = hvRecursive(dimIndex - 1, length, bounds)
-                if qArea[dimIndex] <= qPrevDimIndex.area[dimIndex]:
-                    q.ignore = dimIndex
-            while p is not sentinel:
-                pCargoDimIndex = p.cargo[dimIndex]
-                hvol += q.area[dimIndex] * (pCargoDimIndex - q.cargo[dimIndex])
+                areaD[q] = hvRecursive(dimIndex - 1, length, bounds)
+                if areaD[q] <= areaD[qPrevDimIndex]:
+                    ignore[q] = dimIndex
+            while p != 0:
+                pCargoDimIndex = cargoD[p]
+                hvol += areaD[q] * (pCargoDimIndex - cargoD[q])
                 bounds[dimIndex] = pCargoDimIndex
                 reinsert(p, dimIndex, bounds)
                 length += 1
                 q = p
-                p = p.next[dimIndex]
-                q.volume[dimIndex] = hvol
-                if q.ignore >= dimIndex:
-                    q.area[dimIndex] = q.prev[dimIndex].area[dimIndex]
+                p = nextD[p]
+                volumeD[q] = hvol
+                if ignore[q] >= dimIndex:
+                    areaD[q] = areaD[prevD[q]]
                 else:
-                    q.area[dimIndex] = hvRecursive(dimIndex - 1, length, bounds)
-                    if q.area[dimIndex] <= q.prev[dimIndex].area[dimIndex]:
-                        q.ignore = dimIndex
-            hvol -= q.area[dimIndex] * q.cargo[dimIndex]
+                    areaD[q] = hvRecursive(dimIndex - 1, length, bounds)
+                    if areaD[q] <= areaD[prevD[q]]:
+                        ignore[q] = dimIndex
+            hvol -= areaD[q] * cargoD[q]
             return hvol
 
     def preProcess(self, front):
         """Sets up the list data structure needed for calculation."""
         dimensions = len(self.referencePoint)
-        nodeList = MultiList(dimensions)
-        nodes = [MultiList.Node(dimensions, point) for point in front]
+        points = np.asarray(front, dtype=float)
+        self.list = MultiList(dimensions, points.reshape(-1, dimensions))
+        nodes = np.arange(1, len(points) + 1)
         for i in range(dimensions):
-            self.sortByDimension(nodes, i)
-            nodeList.extend(nodes, i)
-        self.list = nodeList
+            nodes = self.sortByDimension(nodes, i)
+            self.list.extend(nodes, i)
 
     def sortByDimension(self, nodes, i):
-        """Sorts the list of nodes by the i-th value of the contained points."""
-        # build a list of tuples of (point[i], node)
-        idx = np.argsort([node.cargo[i] for node in nodes])
-        # decorated = [(node.cargo[i], node) for node in nodes]
-        # sort by this value
-        # decorated.sort()
-        # write back to original list
-        nodes[:] = [nodes[i] for i in idx]
-        # nodes[:] = [node for (_, node) in decorated]
+        """Sorts the node ids by the i-th value of the contained points."""
+        return nodes[np.argsort(self.list.cargo[nodes, i], kind="stable")]
 
 
 class MultiList:
@@ -208,39 +1083,47 @@ class MultiList:
     It consists of several doubly linked lists that share common nodes. So,
     every node has multiple predecessors and successors, one in every list.
 
-    """
+    The nodes are stored as a struct of preallocated arrays indexed by the
+    node id, where node 0 is the sentinel and node j + 1 holds the j-th point.
+    The compiled kernel works on the arrays in place, while the pure-Python
+    recursion goes through `columns`, one memoryview per array and list that
+    shares the array's memory and is faster to index in CPython.
 
-    class Node:
-        def __init__(self, numberLists, cargo=None):
-            self.cargo = cargo
-            self.next = [None] * numberLists
-            self.prev = [None] * numberLists
-            self.ignore = 0
-            self.area = [0.0] * numberLists
-            self.volume = [0.0] * numberLists
-
-        def __str__(self):
-            return str(self.cargo)
+    """
 
-    def __init__(self, numberLists):
+    def __init__(self, numberLists, cargo=None):
         """Constructor.
 
-        Builds 'numberLists' doubly linked lists.
+        Builds 'numberLists' doubly linked lists over the rows of 'cargo'.
 
         """
+        if cargo is None:
+            cargo = np.empty((0, numberLists))
+        size = len(cargo) + 1
         self.numberLists = numberLists
-        self.sentinel = MultiList.Node(numberLists)
-        self.sentinel.next = [self.sentinel] * numberLists
-        self.sentinel.prev = [self.sentinel] * numberLists
+        self.cargo = np.empty((size, numberLists))
+        self.cargo[0] = np.nan
+        self.cargo[1:] = cargo
+        # all lists are empty, i.e., the sentinel is linked to itself
+        self.next = np.zeros((size, numberLists), dtype=np.intp)
+        self.prev = np.zeros((size, numberLists), dtype=np.intp)
+        self.ignore = np.zeros(size, dtype=np.intp)
+        self.area = np.zeros((size, numberLists))
+        self.volume = np.zeros((size, numberLists))
+        self.columns = tuple(
+            [memoryview(a[:, i]) for i in range(numberLists)]
+            for a in (self.cargo, self.next, self.prev, self.area, self.volume)
+        )
+        self.ignoreColumn = memoryview(self.ignore)
 
     def __str__(self):
         strings = []
         for i in range(self.numberLists):
             currentList = []
-            node = self.sentinel.next[i]
-            while node != self.sentinel:
-                currentList.append(str(node))
-                node = node.next[i]
+            node = self.next[0, i]
+            while node != 0:
+                currentList.append(str(self.cargo[node]))
+                node = self.next[node, i]
             strings.append(str(currentList))
         stringRepr = ""
         for string in strings:
@@ -251,45 +1134,46 @@ class MultiList:
         """Returns the number of lists that are included in this MultiList."""
         return self.numberLists
 
+    @property
+    def nbytes(self):
+        """Returns the memory footprint of the arrays in bytes, which is O(n * numberLists)."""
+        return sum(a.nbytes for a in (self.cargo, self.next, self.prev, self.ignore, self.area, self.volume))
+
     def getLength(self, i):
         """Returns the length of the i-th list."""
         length = 0
-        sentinel = self.sentinel
-        node = sentinel.next[i]
-        while node != sentinel:
+        node = self.next[0, i]
+        while node != 0:
             length += 1
-            node = node.next[i]
+            node = self.next[node, i]
         return length
 
     def append(self, node, index):
         """Appends a node to the end of the list at the given index."""
-        lastButOne = self.sentinel.prev[index]
-        node.next[index] = self.sentinel
-        node.prev[index] = lastButOne
+        lastButOne = self.prev[0, index]
+        self.next[node, index] = 0
+        self.prev[node, index] = lastButOne
         # set the last element as the new one
-        self.sentinel.prev[index] = node
-        lastButOne.next[index] = node
+        self.prev[0, index] = node
+        self.next[lastButOne, index] = node
 
     def extend(self, nodes, index):
         """Extends the list at the given index with the nodes."""
-        sentinel = self.sentinel
-        for node in nodes:
-            lastButOne = sentinel.prev[index]
-            node.next[index] = sentinel
-            node.prev[index] = lastButOne
-            # set the last element as the new one
-            sentinel.prev[index] = node
-            lastButOne.next[index] = node
+        chain = np.r_[self.prev[0, index], nodes, 0]
+        self.next[chain[:-1], index] = chain[1:]
+        self.prev[chain[1:], index] = chain[:-1]
 
     def remove(self, node, index, bounds):
         """Removes and returns 'node' from all lists in [0, 'index'[."""
+        cargo, next_, prev = self.columns[:3]
         for i in range(index):
-            predecessor = node.prev[i]
-            successor = node.next[i]
-            predecessor.next[i] = successor
-            successor.prev[i] = predecessor
-            if bounds[i] > node.cargo[i]:
-                bounds[i] = node.cargo[i]
+            nextI, prevI = next_[i], prev[i]
+            predecessor = prevI[node]
+            successor = nextI[node]
+            nextI[predecessor] = successor
+            prevI[successor] = predecessor
+            if bounds[i] > cargo[i][node]:
+                bounds[i] = cargo[i][node]
         return node
 
     def reinsert(self, node, index, bounds):
@@ -299,8 +1183,175 @@ class MultiList:
         nodes of the node that is reinserted are in the list.
 
         """
+        cargo, next_, prev = self.columns[:3]
         for i in range(index):
-            node.prev[i].next[i] = node
-            node.next[i].prev[i] = node
-            if bounds[i] > node.cargo[i]:
-                bounds[i] = node.cargo[i]
+            nextI, prevI = next_[i], prev[i]
+            nextI[prevI[node]] = node
+            prevI[nextI[node]] = node
+            if bounds[i] > cargo[i][node]:
+                bounds[i] = cargo[i][node]
+
+
+def _compile(func):
+    """compile `func` in the nopython mode once per machine, if `numba` is available"""
+    return func if jit is None else jit(nopython=True, error_model="numpy", cache=True)(func)
+
+
+@_compile
+def _removeKernel(node, index, bounds, cargo, next_, prev):
+    """`MultiList.remove` on the raw arrays"""
+    for i in range(index):
+        predecessor = prev[node, i]
+        successor = next_[node, i]
+        next_[predecessor, i] = successor
+        prev[successor, i] = predecessor
+        if bounds[i] > cargo[node, i]:
+            bounds[i] = cargo[node, i]
+
+
+@_compile
+def _reinsertKernel(node, index, bounds, cargo, next_, prev):
+    """`MultiList.reinsert` on the raw arrays"""
+    for i in range(index):
+        next_[prev[node, i], i] = node
+        prev[next_[node, i], i] = node
+        if bounds[i] > cargo[node, i]:
+            bounds[i] = cargo[node, i]
+
+
+@_compile
+def _hvRecursiveKernel(dimIndex, length, bounds, cargo, next_, prev, area, volume, ignore):
+    """`HyperVolume.hvRecursive` on the raw arrays of `MultiList`"""
+    hvol = 0.0
+    if length == 0:
+        return hvol
+    elif dimIndex == 0:
+        return -cargo[next_[0, 0], 0]
+    elif dimIndex == 1:
+        q = next_[0, 1]
+        h = cargo[q, 0]
+        p = next_[q, 1]
+        while p != 0:
+            hvol += h * (cargo[q, 1] - cargo[p, 1])
+            if cargo[p, 0] < h:
+                h = cargo[p, 0]
+            q = p
+            p = next_[q, 1]
+        hvol += h * cargo[q, 1]
+        return hvol
+    p = 0
+    q = prev[p, dimIndex]
+    while q != 0:
+        if ignore[q] < dimIndex:
+            ignore[q] = 0
+        q = prev[q, dimIndex]
+    q = prev[p, dimIndex]
+    while length > 1 and (
+        cargo[q, dimIndex] > bounds[dimIndex] or cargo[prev[q, dimIndex], dimIndex] >= bounds[dimIndex]
+    ):
+        p = q
+        _removeKernel(p, dimIndex, bounds, cargo, next_, prev)
+        q = prev[p, dimIndex]
+        length -= 1
+    qPrevDimIndex = prev[q, dimIndex]
+    if length > 1:
+        hvol = volume[qPrevDimIndex, dimIndex] + area[qPrevDimIndex, dimIndex] * (
+            cargo[q, dimIndex] - cargo[qPrevDimIndex, dimIndex]
+        )
+    else:
+        area[q, 0] = 1
+        qArea = area[q, :dimIndex].copy()
+        for i in range(dimIndex):
+            area[q, i + 1] = qArea[i] * -cargo[q, i]
+    volume[q, dimIndex] = hvol
+    if ignore[q] >= dimIndex:
+        area[q, dimIndex] = area[qPrevDimIndex, dimIndex]
+    else:
+        area[q, dimIndex] = _hvRecursiveKernel(
+            dimIndex - 1, length, bounds, cargo, next_, prev, area, volume, ignore
+        )
+        if area[q, dimIndex] <= area[qPrevDimIndex, dimIndex]:
+            ignore[q] = dimIndex
+    while p != 0:
+        pCargoDimIndex = cargo[p, dimIndex]
+        hvol += area[q, dimIndex] * (pCargoDimIndex - cargo[q, dimIndex])
+        bounds[dimIndex] = pCargoDimIndex
+        _reinsertKernel(p, dimIndex, bounds, cargo, next_, prev)
+        length += 1
+        q = p
+        p = next_[p, dimIndex]
+        volume[q, dimIndex] = hvol
+        if ignore[q] >= dimIndex:
+            area[q, dimIndex] = area[prev[q, dimIndex], dimIndex]
+        else:
+            area[q, dimIndex] = _hvRecursiveKernel(
+                dimIndex - 1, length, bounds, cargo, next_, prev, area, volume, ignore
+            )
+            if area[q, dimIndex] <= area[prev[q, dimIndex], dimIndex]:
+                ignore[q] = dimIndex
+    hvol -= area[q, dimIndex] * cargo[q, dimIndex]
+    return hvol
+
+
+@_compile
+def _nonDominatedKernel(points):
+    """the non-dominated rows of `points`, where only one copy of duplicated rows is kept"""
+    n, dim = points.shape
+    keep = np.ones(n, dtype=np.bool_)
+    for a in range(n):
+        for b in range(n):
+            if b == a or not keep[b]:
+                continue
+            dominated = True
+            for i in range(dim):
+                if points[b, i] > points[a, i]:
+                    dominated = False
+                    break
+            if dominated:
+                keep[a] = False
+                break
+    return points[keep]
+
+
+@_compile
+def _wfgKernel(points, ref):
+    """`hypervolume_wfg` of the non-dominated `points`, which weakly dominate `ref`"""
+    n, dim = points.shape
+    if n == 0:
+        return 0.0
+    if n == 1:
+        hvol = 1.0
+        for i in range(dim):
+            hvol *= ref[i] - points[0, i]
+        return hvol
+    if dim == 2:
+        hvol, y = 0.0, ref[1]
+        for j in np.argsort(points[:, 0]):
+            if points[j, 1] < y:
+                hvol += (ref[0] - points[j, 0]) * (y - points[j, 1])
+                y = points[j, 1]
+        return hvol
+    last = dim - 1
+    points = points[np.argsort(-points[:, last])]
+    limit = np.empty((n, last))
+    hvol = 0.0
+    for k in range(n):
+        # the limit set of the k-th point w.r.t. the following ones, which are better in the last objective
+        size, covered = 0, False
+        for j in range(k + 1, n):
+            covered = True
+            for i in range(last):
+                limit[size, i] = max(points[k, i], points[j, i])
+                covered = covered and limit[size, i] == points[k, i]
+            if covered:  # the projection of the k-th point is weakly dominated
+                break
+            size += 1
+        if covered:
+            continue
+        volume = 1.0
+        for i in range(last):
+            volume *= ref[i] - points[k, i]
+        if size > 0:
+            volume -= _wfgKernel(_nonDominatedKernel(limit[:size]), ref[:last])
+        hvol += (ref[last] - points[k, last]) * volume
+    return hvol
@@ -1,34 +1,94 @@
-from typing import Dict, List, Tuple, Union
+import os
+import shutil
+import tempfile
+from itertools import islice, product
+from typing import Dict, Iterator, List, Tuple, Union
 
-# TODO: remove dependencies on `autograd` and move to jax
-import autograd.numpy as np
+import jax.numpy as jnp
 import numpy as np
-from autograd import hessian, jacobian
-from scipy.linalg import block_diag
+from jax import grad, hessian, jit, lax
+from jax.experimental import enable_x64
+from joblib import Parallel, cpu_count, delayed, dump, load
+from scipy.sparse import bsr_matrix, csr_matrix, issparse
+from scipy.sparse.linalg import LinearOperator
 
-from .hypervolume import hypervolume
-from .utils import non_domin_sort
+from .hypervolume import hypervolume, hypervolume_gradient_3d
+from .utils import choose_hessian_strategy, evaluate_batch, non_domin_sort
 
 __author__ = "Hao Wang"
 
 
-def HVY(n_objective: int, ref: np.ndarray) -> callable:
-    def _HVY(Y: np.ndarray) -> float:
-        return hypervolume(Y.reshape(-1, n_objective), ref)
-
-    return _HVY
-
-
-def HVX(n_decision_var: int, f: callable, ref: np.ndarray) -> callable:
-    def _HVX(X: np.ndarray) -> float:
-        return hypervolume(np.array([f(x) for x in X.reshape(-1, n_decision_var)]), ref)
-
-    return _HVX
-
-
 def hypervolume_improvement(x: np.ndarray, pareto_front: np.ndarray, ref: np.ndarray) -> float:
-    """minization is assumed"""
-    return hypervolume(np.vstack([x, pareto_front]), ref) - hypervolume(pareto_front.copy(), ref)
+    """minization is assumed
+
+    The volume of the box [x, ref] minus the part of it dominated by `pareto_front`, i.e., the hypervolume of
+    `pareto_front` clipped to the box, which takes a single hypervolume computation.
+    """
+    if np.any(x >= ref) or np.any(np.all(pareto_front <= x, axis=1)):
+        return 0.0
+    return float(np.prod(ref - x)) - hypervolume(np.clip(pareto_front, x, ref), ref)
+
+
+@jit
+def hypervolume_jax(Y: jnp.ndarray, ref: jnp.ndarray) -> float:
+    """JAX-traceable hypervolume of a point set of a fixed shape (N, m), where minimization is assumed
+
+    The coordinates (clipped to `ref`) sorted along each axis split the box below `ref` into a grid of N^m cells.
+    A cell is dominated iff a point is ranked no later than the cell along all axes, which is the prefix
+    maximum of the ranks of the points over the grid. The hypervolume is the total volume of the dominated
+    cells, i.e., a multilinear form in the cell widths. The grid takes O(N^m) memory, e.g., 800 MB in double
+    precision for N = 100 and m = 4, and its derivatives more, such that it is only meant for verifying the
+    analytical derivatives on small point sets.
+    """
+    N, m = Y.shape
+    Y = jnp.minimum(Y, ref)
+    order = jnp.argsort(Y, axis=0)
+    # widths of the cells along each axis, of shape (N, m)
+    W = jnp.diff(jnp.vstack([jnp.take_along_axis(Y, order, axis=0), ref]), axis=0)
+    ranks = jnp.argsort(order, axis=0)
+    D = jnp.zeros((N,) * m).at[tuple(ranks.T)].set(1.0)
+    for k in range(m):
+        D = lax.cummax(D, axis=k)
+    for k in reversed(range(m)):
+        D = D @ W[:, k]
+    return D
+
+
+# compiled once per shape of the point set
+_hypervolume_grad = jit(grad(hypervolume_jax))
+_hypervolume_hessian = jit(hessian(hypervolume_jax))
+
+
+def _staircase_order(pareto_front: np.ndarray) -> np.ndarray:
+    """the order of a two-dimensional Pareto front with increasing y1 and decreasing y2, where the ties
+    (weakly dominated points) are broken in the same way for the gradient and the Hessian"""
+    _, tags = np.unique(pareto_front[:, 0], return_inverse=True)
+    idx1 = np.argsort(-tags, kind="stable")[::-1]
+    _, tags = np.unique(pareto_front[idx1, 1], return_inverse=True)
+    idx2 = np.argsort(-tags, kind="stable")
+    return idx1[idx2]
+
+
+def _dominated(Y: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """whether each row of `Y` is Pareto-dominated by `y` (minimization)"""
+    return np.all(y <= Y, axis=1) & np.any(y < Y, axis=1)
+
+
+def _is_dominated(y: np.ndarray, Y: np.ndarray) -> bool:
+    """whether `y` is Pareto-dominated by any row of `Y` (minimization)"""
+    return bool(np.any(np.all(Y <= y, axis=1) & np.any(Y < y, axis=1)))
+
+
+def _insert_non_dominated(points: np.ndarray, indices: np.ndarray, i: int) -> np.ndarray:
+    """insert the `i`-th point into `indices`, a mutually non-dominated subset of `points`"""
+    y, archive = points[i], points[indices]
+    if points.shape[1] == 1:  # keep the first minimum only, as in the projections
+        if len(indices) == 0 or y[0] < archive[0, 0] or (y[0] == archive[0, 0] and i < indices[0]):
+            return np.array([i])
+        return indices
+    if _is_dominated(y, archive):
+        return indices
+    return np.r_[indices[~_dominated(archive, y)], i]
 
 
 class HypervolumeDerivatives:
@@ -43,6 +103,12 @@ class HypervolumeDerivatives:
         jac: callable = None,
         hessian: callable = None,
         minimization: bool = True,
+        sparse: bool = False,
+        n_jobs: int = 1,
+        memory_limit: int = None,
+        func_batch: callable = None,
+        jac_batch: callable = None,
+        hess_batch: callable = None,
     ):
         """Compute the hypervolume Hessian matrix
 
@@ -65,6 +131,29 @@ class HypervolumeDerivatives:
             shape `(n_objective, n_decision_var, n_decision_var)`, by default None, which evaluates a zero tensor
         maximization : bool, optional
             whether the MOP is subject to maximization, by default True
+        sparse : bool, optional
+            whether the Hessian matrices are assembled as `scipy.sparse` CSR matrices from their non-zero
+            blocks, by default False
+        n_jobs : int, optional
+            the number of worker processes over which the column blocks of the Hessian are distributed
+            for more than two objectives; as in `joblib`, -1 uses all CPUs, -2 all but one, etc., and None
+            is 1, by default 1
+        memory_limit : int, optional
+            the memory budget in bytes for computing the Hessian. Its peak memory is estimated before the assembly
+            and the first of the strategies "dense", "chunked" (a dense Hessian assembled in blocks of rows),
+            "sparse" (CSR matrices), and "matrix-free" (a `scipy.sparse.linalg.LinearOperator`) within the budget
+            is taken, where only the last two are considered if `sparse` is True. The chosen strategy and its
+            estimated peak memory are stored in `hessian_strategy` and `hessian_memory`. By default None,
+            i.e., no budget
+        func_batch : callable, optional
+            the batched version of `func`, which takes decision points of shape `(N, n_decision_var)` and returns
+            an array of shape `(N, n_objective)`; it is preferred over `func` if given, by default None
+        jac_batch : callable, optional
+            the batched version of `jac`, returning an array of shape `(N, n_objective, n_decision_var)`,
+            by default None
+        hess_batch : callable, optional
+            the batched version of `hessian`, returning an array of shape
+            `(N, n_objective, n_decision_var, n_decision_var)`, by default None
         """
         if func is None:
             func = lambda x: x
@@ -78,11 +167,23 @@ class HypervolumeDerivatives:
         self.func = func if minimization else lambda x: -1 * func(x)
         self.jac = jac if minimization else lambda x: -1 * jac(x)
         self.hessian = hessian if minimization else lambda x: -1 * hessian(x)
+        sign = 1 if minimization else -1
+        self.func_batch = func_batch if func_batch is None or minimization else lambda X: sign * func_batch(X)
+        self.jac_batch = jac_batch if jac_batch is None or minimization else lambda X: sign * jac_batch(X)
+        self.hess_batch = hess_batch if hess_batch is None or minimization else lambda X: sign * hess_batch(X)
         self.minimization = minimization
+        self.sparse = sparse
+        if n_jobs is None:
+            n_jobs = 1
+        elif n_jobs < 0:
+            n_jobs = max(1, cpu_count() + 1 + n_jobs)
+        elif n_jobs == 0:
+            raise ValueError("`n_jobs` == 0 has no meaning")
+        self.n_jobs = int(n_jobs)
+        self.memory_limit = memory_limit
+        self.hessian_strategy: str = None
+        self.hessian_memory: int = None
         self.ref = ref
-        # compute those when needed for the first time
-        self._HV_Jac: callable = None
-        self._HV_Hessian: callable = None
 
     @property
     def ref(self):
@@ -93,6 +194,10 @@ class HypervolumeDerivatives:
         if not isinstance(r, np.ndarray):
             r = np.asarray(r)
         self._ref = r if self.minimization else -1 * r
+        # the Hessian factors of the last point set of `hessian_vector_product`
+        self._hvp_cache: Tuple = None
+        # the derivatives of the last point set, which are updated when only a few points change
+        self._derivative_cache: Dict = None
 
     @property
     def objective_points(self):
@@ -108,7 +213,14 @@ class HypervolumeDerivatives:
         if self._objective_points.shape[1] == 1:
             self._nondominated_indices = np.array([np.argmin(self._objective_points.ravel())])
         else:
-            self._nondominated_indices = non_domin_sort(self._objective_points, only_front_indices=True)[0]
+            # points on or outside of the reference box do not contribute to the hypervolume, and they cannot
+            # dominate a point inside of it
+            inside = np.nonzero(np.all(self._objective_points < self.ref, axis=1))[0]
+            self._nondominated_indices = (
+                inside[non_domin_sort(self._objective_points[inside], only_front_indices=True)[0]]
+                if len(inside) > 0
+                else inside
+            )
         # self._nondominated_indices = get_non_dominated(self._objective_points, return_index=True)
         self._dominated_indices = set(range(len(self._objective_points))) - set(self._nondominated_indices)
 
@@ -129,7 +241,7 @@ class HypervolumeDerivatives:
             assert X is not None
             assert self.func is not None
             X = self._check_X(X)
-            Y = np.array([self.func(x) for x in X])
+            Y = evaluate_batch(self.func, X, self.func_batch)
         return hypervolume(Y, self.ref)
 
     def compute_derivatives(
@@ -138,6 +250,7 @@ class HypervolumeDerivatives:
         Y: np.ndarray = None,
         compute_hessian: bool = True,
         YdX: np.ndarray = None,
+        changed: np.ndarray = None,
     ) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
         """compute the derivatives of the inverted generational distance^p
 
@@ -146,25 +259,66 @@ class HypervolumeDerivatives:
             Y (np.ndarray, optional): the objective points of shape (N, n_objective). Defaults to None.
             compute_hessian (bool, optional): whether the Hessian is computed. Defaults to True.
             jacobian (np.ndarray, optional): Jacobian of the objective function at `X`. Defaults to None.
+            changed (np.ndarray, optional): indices of the points that changed since the previous call. If given,
+                only the derivatives of the points whose projected fronts contain a changed point are recomputed,
+                and the objective function is only evaluated at the changed points. Defaults to None.
 
         Returns:
             Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
                 if `compute_hessian` = True, it returns (gradient, Hessian)
                 otherwise, it returns (gradient, )
         """
+        previous = self._derivative_cache
+        if changed is not None:
+            if previous is None or len(previous["Y"]) != len(X) or (compute_hessian and "entries" not in previous):
+                changed = None  # nothing to update
+            else:
+                changed = np.isin(np.arange(len(X)), changed)
         if compute_hessian:
-            out = self._compute_hessian(X, Y, YdX)
+            out = self._compute_hessian(X, Y, YdX, changed)
             HVdX, HVdX2 = out["HVdX"], out["HVdX2"]
         else:
-            HVdX = self._compute_gradient(X, Y, YdX)["HVdX"]
+            HVdX = self._compute_gradient(X, Y, YdX, changed)["HVdX"]
         HVdX = HVdX.reshape(len(X), -1)
         return (HVdX, HVdX2) if compute_hessian else HVdX
 
+    def compute_value_and_derivatives(
+        self,
+        X: np.ndarray,
+        Y: np.ndarray = None,
+        compute_hessian: bool = True,
+        YdX: np.ndarray = None,
+        changed: np.ndarray = None,
+    ) -> Union[Tuple[float, np.ndarray], Tuple[float, np.ndarray, np.ndarray]]:
+        """compute the hypervolume indicator value along with its derivatives in one pass
+
+        Sweeping along an axis `k` without ties among the non-dominated points, the area of the slice of the
+        dominated space grows by the face -∂HV/∂y_k^i at y_k^i, such that HV = -sum_i ∂HV/∂y_k^i (r_k - y_k^i),
+        which is read off the gradient instead of computing the hypervolume again.
+
+        Args: the same as `compute_derivatives`
+
+        Returns:
+            Union[Tuple[float, np.ndarray], Tuple[float, np.ndarray, np.ndarray]]:
+                if `compute_hessian` = True, it returns (value, gradient, Hessian)
+                otherwise, it returns (value, gradient)
+        """
+        out = self.compute_derivatives(X, Y, compute_hessian, YdX, changed)
+        idx = self._derivative_cache["nondominated"]
+        Y, HVdY = self._derivative_cache["Y"][idx], self._derivative_cache["HVdY"][idx]
+        axes = [k for k in range(self.n_obj) if len(np.unique(Y[:, k])) == len(Y)]
+        if len(axes) == 0 or np.any(Y >= self.ref):  # ties or points on or outside of the reference box
+            value = hypervolume(Y, self.ref)
+        else:
+            value = float(-1.0 * np.sum(HVdY[:, axes[0]] * (self.ref[axes[0]] - Y[:, axes[0]])))
+        return (value, *out) if compute_hessian else (value, out)
+
     def _compute_gradient(
         self,
         X: np.ndarray,
         Y: np.ndarray = None,
         YdX: np.ndarray = None,
+        changed: np.ndarray = None,
     ) -> Dict[str, np.ndarray]:
         """compute the hypervolume gradient using analytical expressions
 
@@ -182,26 +336,48 @@ class HypervolumeDerivatives:
                     shape (`N` * `n_decision_var`, ),
                 "HVdY": gradient of the hypervolume indicator w.r.t. the objective variable of
                     shape (`N` * `n_objective`, ),
-                "YdX": Jacobian of the objective function w.r.t. the decision variable
-                    of shape `(N * n_objective, N * n_decision_var)`, a block-diagonal matrix,
-                "YdX2": Hessian tensor of the objective function  w.r.t. the objective variable
-                    of shape `(N * n_objective, N * n_decision_var, N * n_decision_var)`,
-                    a "block-diagonal" tensor,
+                "YdX": Jacobians of the objective function w.r.t. the decision variable
+                    of shape `(N, n_objective, n_decision_var)`, i.e., the diagonal blocks,
             }
         """
         X = self._check_X(X)
-        Y, YdX = self._compute_objective_derivatives(X, Y, YdX)
-        self.objective_points = Y
-        HVdY = np.zeros((self.N, self.n_obj))
-        HVdY[self._nondominated_indices] = self.hypervolume_dY(
-            self.objective_points[self._nondominated_indices], self.ref
+        Y, YdX = self._compute_objective_derivatives(X, Y, YdX, changed=changed)
+        return self._gradient(Y, YdX, changed)
+
+    def _gradient(
+        self, Y: np.ndarray, YdX: np.ndarray, changed: np.ndarray = None, HVdY: np.ndarray = None
+    ) -> Dict[str, np.ndarray]:
+        """the gradient from already evaluated objective points and Jacobians, which also sets up the
+        non-dominated partition (via `objective_points`) shared with the Hessian computation
+
+        If the mask `changed` is given, the gradient entries of the points whose projected fronts do not contain a
+        changed point are taken from the previous call (only for more than three objectives, since the sweeps
+        for two and three objectives are cheaper than finding the affected points). If `HVdY` of shape
+        (`N`, `n_objective`) is given, it is the gradient w.r.t. `Y`, whose partition is set up already.
+        """
+        previous = self._derivative_cache
+        if HVdY is None:
+            self.objective_points = Y
+            idx = self._nondominated_indices
+            HVdY = np.zeros((self.N, self.n_obj))
+            if changed is None or self.n_obj <= 3:
+                HVdY[idx] = self.hypervolume_dY(Y[idx], self.ref)
+            else:
+                idx_ = previous["nondominated"]
+                # points entering or leaving the non-dominated subset change the projected fronts as well
+                changed = changed | (np.isin(np.arange(self.N), idx) != np.isin(np.arange(self.N), idx_))
+                fronts = [(previous["Y"][idx_], idx_), (Y[idx], idx)]
+                mask = np.array([self._affected_points(k, fronts, changed)[idx] for k in range(self.n_obj)]).T
+                HVdY[idx] = self._projected_hypervolume_dY(Y[idx], self.ref, previous["HVdY"][idx], mask)
+        self._derivative_cache = dict(
+            Y=Y.copy(), YdX=YdX.copy(), HVdY=HVdY.copy(), nondominated=self._nondominated_indices
         )
+        HVdX = np.einsum("ij,ijk->ik", HVdY, YdX).ravel()
         HVdY = HVdY.reshape(1, -1)[0]
-        HVdX = HVdY @ YdX
         return dict(HVdX=HVdX, HVdY=HVdY, YdX=YdX)
 
     def _compute_hessian(
-        self, X: np.ndarray, Y: np.ndarray = None, YdX: np.ndarray = None
+        self, X: np.ndarray, Y: np.ndarray = None, YdX: np.ndarray = None, changed: np.ndarray = None
     ) -> Dict[str, np.ndarray]:
         """compute the hypervolume gradient and Hessian matrix using analytical expressions
 
@@ -224,49 +400,41 @@ class HypervolumeDerivatives:
                 "HVdY2": Hessian of the hypervolume indicator w.r.t. the objective variable
                     of shape (`N` * `n_objective`, `N` * `n_objective`)
             }
+            where the Hessians are dense or CSR matrices (or a `LinearOperator` for `HVdX2`) depending on
+            `self.hessian_strategy`
         """
         X = self._check_X(X)
-        # TODO: fix passing the input arugment `YdX`
-        res = self._compute_gradient(X, Y, YdX)
-        Y, YdX, YdX2 = self._compute_objective_derivatives(X, Y, YdX, compute_hessian=True)
+        previous = self._derivative_cache
+        # evaluate `func`, `jac`, and `hessian` once and share them with the gradient
+        Y, YdX, YdX2 = self._compute_objective_derivatives(X, Y, YdX, compute_hessian=True, changed=changed)
+        # the gradient and the non-zero entries of `HVdY2`
+        if changed is not None and self.n_obj > 2:
+            res = self._gradient(Y, YdX, changed)
+            rows, cols, values = self._updated_hessian_entries(previous, changed)
+        else:
+            res, (rows, cols, values) = self._gradient_and_hessian_entries(Y, YdX)
         HVdY, HVdX = res["HVdY"], res["HVdX"]
-        HVdY2 = np.zeros((self.N * self.n_obj, self.N * self.n_obj))
-        for i in range(self.N):
-            if i in self._dominated_indices:  # if the point is dominated
-                continue
-            for k in range(self.n_obj):
-                # project along `axis`; `*_` indicates variables in the projected subspace
-                y_, pareto_front_, ref_, proj_idx = self._project(axis=k, i=i)
-                # partial derivatives ∂(∂HV/∂y_k^i)/∂y^i
-                # of shape (1, dim), where the k-th element is zero
-                Y_ = np.vstack([y_, pareto_front_])
-                pareto_indices = (
-                    np.array([np.argmin(Y_.ravel())])
-                    if Y_.shape[1] == 1
-                    else non_domin_sort(Y_, only_front_indices=True)[0]
-                )
-                # pareto_indices = get_non_dominated(Y_, return_index=True)
-                idx = np.where(pareto_indices == 0)[0]
-                out = self.hypervolume_dY(Y_[pareto_indices], ref_)[idx]
-
-                rows = slice(i * self.n_obj, (i + 1) * self.n_obj)
-                HVdY2[rows, i * self.n_obj + k] = np.insert(-1.0 * out, k, 0)
-                # partial derivatives ∂(∂HV/∂y_k^i)/∂y^{-i}
-                # of shape (len(proj_idx), dim), where the k-th element is zero
-                # ∂HV/∂y_k^i is the hypervolume improvement of `x_` w.r.t. `pareto_front_`
-                out = self.hypervolume_dY(np.clip(pareto_front_, y_, ref_), ref=ref_)
-                # get the dimension of points in `pareto_front_` that are not dominated by `x_`
-                idx = pareto_front_ < y_
-                out[idx] = 0
-                # hypervolume improvement of points in `pareto_front_` decreases ∂HV/∂y_k^i
-                out = np.insert(out, k, 0, axis=1)
-                for s, j in enumerate(proj_idx):
-                    rows = slice(j * self.n_obj, (j + 1) * self.n_obj)
-                    HVdY2[rows, i * self.n_obj + k] = out[s]
-
-        # TODO: use sparse matrix multiplication here
-        HVdX2 = YdX.T @ HVdY2 @ YdX + np.einsum("...i,i...", HVdY, YdX2)
-        HVdX2 = (HVdX2 + HVdX2.T) / 2
+        self._derivative_cache.update(YdX2=YdX2, entries=(rows, cols, values))
+        # choose how to assemble the Hessians within `self.memory_limit`
+        strategy, chunk_size = self._choose_hessian_strategy(rows, cols)
+        shape = (self.N * self.n_obj, self.N * self.n_obj)
+        if strategy == "dense":
+            HVdY2 = np.zeros(shape)
+            HVdY2[rows, cols] = values
+        else:
+            nonzero = values != 0
+            HVdY2 = csr_matrix((values[nonzero], (rows[nonzero], cols[nonzero])), shape=shape)
+
+        if strategy == "chunked":
+            HVdX2 = self._chunked_chain_rule_hessian(HVdY, HVdY2, YdX, YdX2, chunk_size)
+        elif strategy == "matrix-free":
+            factors = self._hessian_factors(HVdY, HVdY2, YdX, YdX2)
+            HVdX2 = LinearOperator(
+                (self.N * self.n_var,) * 2, matvec=lambda v: self._hessian_product(*factors, v).ravel(), dtype=float
+            )
+        else:
+            HVdX2 = self._chain_rule_hessian(HVdY, HVdY2, YdX, YdX2)
+            HVdX2 = (HVdX2 + HVdX2.T) / 2
         return dict(
             Y=self.objective_points if self.minimization else -1 * self.objective_points,
             HVdX=HVdX,
@@ -275,28 +443,289 @@ class HypervolumeDerivatives:
             HVdY2=HVdY2,
         )
 
-    def _project(
-        self, axis: int, i: int, pareto_front: np.ndarray = None, ref: np.ndarray = None
-    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
-        """projecting the Pareto front along `axis` with respect to the i-th point"""
+    def _gradient_and_hessian_entries(
+        self, Y: np.ndarray, YdX: np.ndarray
+    ) -> Tuple[Dict[str, np.ndarray], Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """the gradient (as for `_gradient`) and the non-zero entries of `HVdY2`, where the gradient is read off
+        the projections of the sweeps for the entries for more than three objectives, instead of sweeping along
+        each axis once more"""
+        if self.n_obj <= 3:
+            res = self._gradient(Y, YdX)
+            return res, self._hessian_entries_2d() if self.n_obj == 2 else self._hessian_entries()
+        self.objective_points = Y
+        HVdY = np.zeros((self.N, self.n_obj))
+        entries = self._hessian_entries(HVdY)
+        return self._gradient(Y, YdX, HVdY=HVdY), entries
+
+    def _choose_hessian_strategy(self, rows: np.ndarray, cols: np.ndarray) -> Tuple[str, int]:
+        """choose the strategy to assemble `HVdX2` from its peak memory estimated with (N, n_var, n_obj) and
+        the non-zero entries of `HVdY2`, and the number of points per block of rows for the chunked assembly"""
+        N, m, n = self.N, self.n_obj, self.n_var
+        # the pairs of points coupled in `HVdY2`, i.e., the non-zero blocks of `HVdX2`
+        pairs = len(np.unique(np.r_[rows // m * N + cols // m, cols // m * N + rows // m, np.arange(N) * (N + 1)]))
+        # the objective derivatives, and the entries of `HVdY2` with its symmetric part in CSR format
+        base = 8 * N * m * n * (n + 2) + 40 * len(rows)
+        row_block = 8 * n * N * n  # one point in the block rows of the chunked assembly
+        footprints = {
+            # `HVdY2`, the contraction with one Jacobian, and `HVdX2` with its symmetric part
+            "dense": base + 8 * ((N * m) ** 2 + N**2 * m * n + 3 * (N * n) ** 2),
+            # `HVdX2`, `HVdY2 @ J` in CSR format, and one block of rows
+            "chunked": base + 8 * (N * n) ** 2 + 12 * len(rows) * n + row_block,
+            # `HVdX2` in CSR format with its transpose and symmetric part
+            "sparse": base + 36 * pairs * n**2,
+            # the symmetric parts of the diagonal blocks
+            "matrix-free": base + 16 * N * n**2,
+        }
+        if self.sparse:
+            del footprints["dense"], footprints["chunked"]
+        self.hessian_strategy, self.hessian_memory = choose_hessian_strategy(footprints, self.memory_limit)
+        chunk_size = N
+        if self.hessian_strategy == "chunked" and self.memory_limit is not None:
+            chunk_size = int(max(1, 1 + (self.memory_limit - self.hessian_memory) // row_block))
+        return self.hessian_strategy, chunk_size
+
+    def _hessian_entries(self, HVdY: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """the row indices, column indices and values of the non-zero entries of `HVdY2`, where a point only
+        couples with the points in its projected fronts, and the gradient is written into `HVdY` if given"""
+        if self.n_jobs == 1:
+            blocks = [self._hessian_entries_axis(k, HVdY=HVdY) for k in range(self.n_obj)]
+            return tuple(np.concatenate(v) for v in zip(*blocks))
+        # contiguous parts of the sweep along each axis, whose entries are written in the serial order into
+        # a buffer shared with the workers, which read the objective points from shared memory as well
+        n_chunks = max(1, min(len(self.objective_points), 4 * self.n_jobs))
+        tasks, size = [], 0
+        for k in range(self.n_obj):
+            for start, stop, archive, count in self._sweep_chunks(k, n_chunks):
+                tasks.append((k, start, stop, archive, size))
+                size += count
+        if size == 0:  # no point lies inside of the reference box
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros(0)
+        folder = tempfile.mkdtemp()
+        try:
+            dump(self.objective_points, os.path.join(folder, "Y"))
+            Y = load(os.path.join(folder, "Y"), mmap_mode="r")
+            indices = np.memmap(os.path.join(folder, "indices"), dtype=int, shape=(2, size), mode="w+")
+            values = np.memmap(os.path.join(folder, "values"), dtype=float, shape=(size,), mode="w+")
+            gradient = None
+            if HVdY is not None:
+                gradient = np.memmap(os.path.join(folder, "gradient"), dtype=float, shape=HVdY.shape, mode="w+")
+            Parallel(n_jobs=self.n_jobs)(
+                delayed(_hessian_entries_chunk)(
+                    Y, self.ref, k, start, stop, archive, indices, values, offset, gradient
+                )
+                for k, start, stop, archive, offset in tasks
+            )
+            if HVdY is not None:
+                HVdY[:] = gradient
+            return np.array(indices[0]), np.array(indices[1]), np.array(values)
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    def _sweep_chunks(self, axis: int, n_chunks: int) -> List[Tuple[int, int, np.ndarray, int]]:
+        """split the sweep along `axis` into at most `n_chunks` contiguous parts of roughly equal numbers of points
+
+        Only the archive of the sweep is updated here, without any hypervolume computation, such that each part
+        starts from its precomputed state instead of replaying the sweep before it.
+
+        Returns:
+            List[Tuple[int, int, np.ndarray, int]]: (start, stop, archive, count) for each part -> its positions in
+                the sweep, the state of the sweep at `start`, and the number of its non-zero entries of `HVdY2`
+        """
+        N = len(self.objective_points)
+        values = np.sort(self.objective_points[:, axis])
+        # a part starts with a group of points tied along `axis`, which are not below each other
+        starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+        bounds = np.linspace(0, N, n_chunks + 1).astype(int)[:-1]
+        positions = np.searchsorted(starts, bounds)
+        bounds = np.unique(starts[positions[positions < len(starts)]])
+        chunks = []
+        for p, (i, _, _, _, idx) in enumerate(self._projections(axis)):
+            if len(chunks) < len(bounds) and p == bounds[len(chunks)]:
+                chunks.append([p, N, idx, 0])
+                if len(chunks) > 1:
+                    chunks[-2][1] = p
+            if i not in self._dominated_indices:
+                chunks[-1][3] += self.n_obj * (1 + len(idx))
+        return [tuple(c) for c in chunks]
+
+    def _updated_hessian_entries(
+        self, previous: Dict, changed: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """the non-zero entries of `HVdY2`, where only the column blocks of the points whose projected fronts
+        contain a changed point are recomputed and the other ones are taken from the `previous` entries"""
+        rows, cols, values = previous["entries"]
+        indices = np.arange(self.N)
+        # points entering or leaving the non-dominated subset gain or lose their column blocks
+        moved = np.isin(indices, self._nondominated_indices) != np.isin(indices, previous["nondominated"])
+        keep, blocks = np.ones(len(cols), dtype=bool), []
+        for k in range(self.n_obj):
+            affected = self._affected_points(k, [(previous["Y"], indices), (self.objective_points, indices)], changed)
+            affected |= moved
+            keep &= ~np.isin(cols, indices[affected] * self.n_obj + k)
+            blocks.append(self._hessian_entries_axis(k, points=affected))
+        blocks.insert(0, (rows[keep], cols[keep], values[keep]))
+        return tuple(np.concatenate(v) for v in zip(*blocks))
+
+    def _affected_points(
+        self, axis: int, fronts: List[Tuple[np.ndarray, np.ndarray]], changed: np.ndarray
+    ) -> np.ndarray:
+        """mask of the changed points and the points whose projected front along `axis` contains a changed point
+        in any of `fronts`, which are pairs of objective points and their indices in the approximation set"""
+        affected = changed.copy()
+        for Y, indices in fronts:
+            for i, _, _, _, idx in self._projections(axis, Y):
+                affected[indices[i]] |= np.any(changed[indices[idx]])
+        return affected
+
+    def _hessian_entries_axis(
+        self,
+        axis: int,
+        start: int = 0,
+        stop: int = None,
+        points: np.ndarray = None,
+        archive: np.ndarray = None,
+        HVdY: np.ndarray = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """the non-zero entries of `HVdY2` in the columns of the `axis`-th objective, for the points
+        from `start` to `stop` in the sweep along `axis` (and only those in the mask `points` if given),
+        where `archive` is the state of the sweep at `start` (see `_sweep_chunks`)
+
+        If `HVdY` is given, the partial derivatives ∂HV/∂y_k^i of those points are written into it, which are
+        minus the hypervolume improvements of their projections w.r.t. the same projected fronts.
+        """
+        rows, cols, values = [], [], []
+        projections = self._projections(axis, start=start, archive=archive)
+        # project along `axis`; `*_` indicates variables in the projected subspace
+        for i, y_, pareto_front_, ref_, proj_idx in islice(projections, None if stop is None else stop - start):
+            if i in self._dominated_indices:  # if the point is dominated
+                continue
+            if points is not None and not points[i]:
+                continue
+            # partial derivatives ∂(∂HV/∂y_k^i)/∂y^i
+            # of shape (1, dim), where the k-th element is zero
+            if HVdY is not None:
+                # NOTE: `-1.0` -> since we assume a minimization problem
+                HVdY[i, axis] = -1.0 * hypervolume_improvement(y_, pareto_front_, ref_)
+            out = np.zeros((0, self.n_obj - 1))
+            if not _is_dominated(y_, pareto_front_):
+                Y_ = np.vstack([y_, pareto_front_[~_dominated(pareto_front_, y_)]])
+                out = self.hypervolume_dY(Y_, ref_)[:1]
+
+            rows.append(np.arange(i * self.n_obj, (i + 1) * self.n_obj))
+            cols.append(np.full(self.n_obj, i * self.n_obj + axis))
+            values.append(np.insert(-1.0 * out.ravel(), axis, 0) if out.size else np.zeros(self.n_obj))
+            # partial derivatives ∂(∂HV/∂y_k^i)/∂y^{-i}
+            # of shape (len(proj_idx), dim), where the k-th element is zero
+            # ∂HV/∂y_k^i is the hypervolume improvement of `x_` w.r.t. `pareto_front_`
+            out = self.hypervolume_dY(np.clip(pareto_front_, y_, ref_), ref=ref_)
+            # get the dimension of points in `pareto_front_` that are not dominated by `x_`
+            idx = pareto_front_ < y_
+            out[idx] = 0
+            # hypervolume improvement of points in `pareto_front_` decreases ∂HV/∂y_k^i
+            out = np.insert(out, axis, 0, axis=1)[: len(proj_idx)]
+            rows.append((proj_idx[:, None] * self.n_obj + np.arange(self.n_obj)).ravel())
+            cols.append(np.full(out.size, i * self.n_obj + axis))
+            values.append(out.ravel())
+        return tuple(np.concatenate(v) if v else np.zeros(0, dtype=int) for v in (rows, cols, values))
+
+    def _hessian_entries_2d(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """the non-zero entries of `HVdY2` for two objectives in closed form
+
+        With the non-dominated points sorted in increasing order of `y_1`, HV = sum_i (y_1^{i+1} - y_1^i)(r_2 - y_2^i),
+        such that ∂²HV/∂y_1^i∂y_2^i = 1 and ∂²HV/∂y_1^{i+1}∂y_2^i = -1, i.e., the Hessian is tridiagonal in this order.
+        Duplicated points are ordered as in `hypervolume_dY`, such that this is the Jacobian of its gradient.
+        """
+        idx = self._nondominated_indices
+        idx = idx[_staircase_order(self.objective_points[idx])]
+        prev, curr = idx[:-1], idx[1:]
+        rows = np.r_[2 * idx, 2 * idx + 1, 2 * curr, 2 * prev + 1]
+        cols = np.r_[2 * idx + 1, 2 * idx, 2 * prev + 1, 2 * curr]
+        values = np.r_[np.ones(2 * len(idx)), -np.ones(2 * len(curr))]
+        return rows, cols, values
+
+    def hessian_vector_product(
+        self, X: np.ndarray, v: np.ndarray, Y: np.ndarray = None, YdX: np.ndarray = None
+    ) -> np.ndarray:
+        """compute the product of the hypervolume Hessian w.r.t. the decision variables and `v`, i.e.,
+        `J^T (HVdY2 (J v)) + sum_i HVdY_i (H_i v_i)`, without forming the Hessian
+
+        `HVdY2` is kept as a sparse matrix and the objective Hessians are contracted per point, such that
+        the memory is linear in `N`. Both are reused for further products at the same `X`, `Y` and `YdX`,
+        e.g., inside an iterative solver.
+
+        Args:
+            X (np.ndarray): the decision points of shape (N, dim).
+            v (np.ndarray): the vector of shape (N, dim) or (N * dim, ).
+            Y (np.ndarray, optional): the objective points of shape (N, n_objective). Defaults to None.
+            YdX (np.ndarray, optional): Jacobian of the objective function at `X`. Defaults to None.
+
+        Returns:
+            np.ndarray: the product of shape (N, dim)
+        """
+        X = self._check_X(X)
+        # the factors depend on `Y` and `YdX` as well if they are given instead of being evaluated at `X`
+        key = tuple(None if a is None else np.array(a, dtype=float) for a in (X, Y, YdX))
+        if self._hvp_cache is None or not all(np.array_equal(a, b) for a, b in zip(self._hvp_cache[0], key)):
+            Y, YdX, YdX2 = self._compute_objective_derivatives(X, Y, YdX, compute_hessian=True)
+            res, (rows, cols, values) = self._gradient_and_hessian_entries(Y, YdX)
+            HVdY2 = csr_matrix((values, (rows, cols)), shape=(self.N * self.n_obj, self.N * self.n_obj))
+            self._hvp_cache = (key, *self._hessian_factors(res["HVdY"], HVdY2, YdX, YdX2))
+        return self._hessian_product(*self._hvp_cache[1:], v)
+
+    def _hessian_factors(
+        self, HVdY: np.ndarray, HVdY2: csr_matrix, YdX: np.ndarray, YdX2: np.ndarray
+    ) -> Tuple[np.ndarray, csr_matrix, np.ndarray]:
+        """the factors of the Hessian-vector products: the Jacobians, and the symmetric parts (as for `HVdX2`)
+        of `HVdY2` and of the objective Hessians contracted with `HVdY` per point"""
+        blocks = np.einsum("ij,ijkl->ikl", HVdY.reshape(len(YdX), self.n_obj), YdX2)
+        return YdX, (HVdY2 + HVdY2.T) / 2, (blocks + np.swapaxes(blocks, 1, 2)) / 2
+
+    def _hessian_product(self, YdX: np.ndarray, HVdY2: csr_matrix, blocks: np.ndarray, v: np.ndarray) -> np.ndarray:
+        """the product of the Hessian given by its factors and `v`, of shape (N, n_decision_var)"""
+        v = np.reshape(v, (len(YdX), self.n_var))
+        w = (HVdY2 @ np.einsum("ijk,ik->ij", YdX, v).ravel()).reshape(len(YdX), self.n_obj)
+        return np.einsum("ijk,ij->ik", YdX, w) + np.einsum("ikl,il->ik", blocks, v)
+
+    def _projections(
+        self,
+        axis: int,
+        pareto_front: np.ndarray = None,
+        ref: np.ndarray = None,
+        start: int = 0,
+        archive: np.ndarray = None,
+    ) -> Iterator[Tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """projecting the Pareto front along `axis` with respect to each point, in a single sweep
+
+        The points are visited in increasing order of the `axis`-th objective, such that the points below the
+        current one are the ones visited before. The non-dominated subset of their projections is updated
+        with each visited point instead of being sorted from scratch. The sweep is resumed at the position
+        `start`, which begins a group of tied points, if `archive` holds the indices of that subset there.
+
+        Yields:
+            Tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]: (i, y_, pareto_front_, ref_, idx) ->
+                the index of the point, its projection, the non-dominated projected points below it,
+                the projected reference point, and the indices of those points
+        """
         pareto_front = self.objective_points if pareto_front is None else pareto_front
         ref = self.ref if ref is None else ref
-        y = pareto_front[i, :]
         # projection: drop the `axis`-th dimension
-        y_ = np.delete(y, obj=axis)
         ref_ = np.delete(ref, obj=axis)
-        idx = np.nonzero(pareto_front[:, axis] < y[axis])[0]
-        pareto_front_ = np.delete(pareto_front[idx, :], obj=axis, axis=1)
-        if len(pareto_front_) != 0:
-            if pareto_front_.shape[1] == 1:
-                pareto_indices = np.array([np.argmin(pareto_front_.ravel())])
-            else:
-                pareto_indices = non_domin_sort(pareto_front_, only_front_indices=True)[0]
-            # NOTE: implement a fast algorithm to get the non dominated subset
-            # pareto_indices = get_non_dominated(pareto_front_, return_index=True)
-            pareto_front_ = pareto_front_[pareto_indices]
-            idx = idx[pareto_indices]
-        return y_, pareto_front_, ref_, idx
+        Y_ = np.delete(pareto_front, obj=axis, axis=1)
+        order = np.argsort(pareto_front[:, axis], kind="stable")
+        values = pareto_front[order, axis]
+        # points on or outside of the reference box are never part of a projected front
+        inside = np.all(pareto_front < ref, axis=1)
+        archive = np.zeros(0, dtype=int) if archive is None else archive
+        while start < len(order):
+            # points with the same `axis`-th value are not below each other
+            end = np.searchsorted(values, values[start], side="right")
+            idx = np.sort(archive)
+            for i in order[start:end]:
+                yield i, Y_[i], Y_[idx], ref_, idx
+            for i in order[start:end]:
+                if inside[i]:
+                    archive = _insert_non_dominated(Y_, archive, i)
+            start = end
 
     def compute_automatic_differentiation(self, X: np.ndarray) -> Dict[str, np.ndarray]:
         """compute the hypervolume gradient and Hessian matrix using automatic differentiation
@@ -321,21 +750,64 @@ class HypervolumeDerivatives:
                     of shape (`N` * `n_objective`, `N` * `n_objective`)
             }
         """
-        if self._HV_Jac is None:
-            self._HV_Jac = jacobian(HVY(self.n_obj, self.ref))
-        if self._HV_Hessian is None:
-            self._HV_Hessian = hessian(HVY(self.n_obj, self.ref))
-
         X = self._check_X(X)
         Y, YdX, YdX2 = self._compute_objective_derivatives(X, compute_hessian=True)
-        # NOTE: atuograd does not support matrix input
-        HVdY = self._HV_Jac(Y.ravel())
-        HVdY2 = self._HV_Hessian(Y.ravel())
-        HVdX = HVdY @ YdX
-        HVdX2 = YdX.T @ HVdY2 @ YdX + np.einsum("...i,i...", HVdY, YdX2)
+        with enable_x64():
+            Y_, ref = jnp.asarray(Y, dtype=float), jnp.asarray(self.ref, dtype=float)
+            HVdY = np.asarray(_hypervolume_grad(Y_, ref)).ravel()
+            HVdY2 = np.asarray(_hypervolume_hessian(Y_, ref)).reshape(Y.size, Y.size)
+        HVdX = np.einsum("ij,ijk->ik", HVdY.reshape(self.N, -1), YdX).ravel()
+        HVdX2 = self._chain_rule_hessian(HVdY, HVdY2, YdX, YdX2)
         HVdX2 = (HVdX2 + HVdX2.T) / 2
         return dict(HVdX=HVdX, HVdY=HVdY if self.minimization else -1 * HVdY, HVdX2=HVdX2, HVdY2=HVdY2)
 
+    def _chain_rule_hessian(
+        self, HVdY: np.ndarray, HVdY2: np.ndarray, YdX: np.ndarray, YdX2: np.ndarray
+    ) -> np.ndarray:
+        """compute the Hessian w.r.t. the decision variables `J.T @ HVdY2 @ J + sum_k HVdY_k * YdX2_k`
+        block-wise, where `J` is the block-diagonal matrix of the Jacobians and the second term only
+        contributes to the diagonal blocks
+
+        Args:
+            HVdY (np.ndarray): gradient in the objective space of shape (`N` * `n_objective`, )
+            HVdY2 (np.ndarray): Hessian in the objective space of shape (`N` * `n_objective`, `N` * `n_objective`)
+            YdX (np.ndarray): Jacobians of shape (`N`, `n_objective`, `n_decision_var`)
+            YdX2 (np.ndarray): Hessians of shape (`N`, `n_objective`, `n_decision_var`, `n_decision_var`)
+
+        Returns:
+            np.ndarray: of shape (`N` * `n_decision_var`, `N` * `n_decision_var`), a CSR matrix if `HVdY2` is sparse
+        """
+        N, n_obj, n_var = YdX.shape
+        blocks = np.einsum("ij,ijkl->ikl", HVdY.reshape(N, n_obj), YdX2)
+        if issparse(HVdY2):
+            idx = np.arange(N + 1)
+            J = bsr_matrix((YdX, idx[:-1], idx), shape=(N * n_obj, N * n_var))
+            return (J.T @ HVdY2 @ J + bsr_matrix((blocks, idx[:-1], idx), shape=(N * n_var, N * n_var))).tocsr()
+        HVdY2 = HVdY2.reshape(N, n_obj, N, n_obj)
+        out = np.ascontiguousarray(np.einsum("iak,iajb,jbl->ikjl", YdX, HVdY2, YdX, optimize=True))
+        idx = np.arange(N)
+        out[idx, :, idx, :] += blocks
+        return out.reshape(N * n_var, N * n_var)
+
+    def _chunked_chain_rule_hessian(
+        self, HVdY: np.ndarray, HVdY2: csr_matrix, YdX: np.ndarray, YdX2: np.ndarray, chunk_size: int
+    ) -> np.ndarray:
+        """the symmetric part of `HVdX2` as a dense matrix, which is assembled from the sparse `HVdY2` in blocks
+        of rows of `chunk_size` points, such that no dense intermediate of the size of `HVdX2` is allocated"""
+        N, n_obj, n_var = YdX.shape
+        idx = np.arange(N + 1)
+        J = bsr_matrix((YdX, idx[:-1], idx), shape=(N * n_obj, N * n_var)).tocsr()
+        HJ = (((HVdY2 + HVdY2.T) / 2) @ J).tocsr()
+        JT = J.T.tocsr()
+        out = np.empty((N * n_var, N * n_var))
+        for start in range(0, N, chunk_size):
+            rows = slice(start * n_var, min(start + chunk_size, N) * n_var)
+            out[rows] = (JT[rows] @ HJ).toarray()
+        blocks = np.einsum("ij,ijkl->ikl", HVdY.reshape(N, n_obj), YdX2)
+        for i, block in enumerate((blocks + np.swapaxes(blocks, 1, 2)) / 2):
+            out[i * n_var : (i + 1) * n_var, i * n_var : (i + 1) * n_var] += block
+        return out
+
     def hypervolume_dY(self, pareto_front: np.ndarray, ref: np.ndarray) -> np.ndarray:
         """compute the gradient of hypervolume indicator in the objective space, i.e.,
         \partial HV / \partial Y
@@ -352,24 +824,100 @@ class HypervolumeDerivatives:
         if len(ref) == 1:  # 1D case
             HVdY = np.array([[-1]])
         elif len(ref) == 2:  # 2D case
-            # sort the pareto front with repsect to increasing y1 and decreasing y2
-            # NOTE: weakly dominbated pointed are handled here
-            _, tags = np.unique(pareto_front[:, 0], return_inverse=True)
-            idx1 = np.argsort(-tags, kind="stable")[::-1]
-            _, tags = np.unique(pareto_front[idx1, 1], return_inverse=True)
-            idx2 = np.argsort(-tags, kind="stable")
-            idx = idx1[idx2]
-            # idx = np.argsort(pareto_front[:, 0])
+            idx = _staircase_order(pareto_front)
             sorted_pareto_front = pareto_front[idx]
             y1 = sorted_pareto_front[:, 0]
             y2 = sorted_pareto_front[:, 1]
             HVdY[idx, 0] = y2 - np.r_[ref[1], y2[0:-1]]
             HVdY[idx, 1] = y1 - np.r_[y1[1:], ref[0]]
+        elif len(ref) == 3:  # 3D case: one sweep along each axis
+            HVdY = hypervolume_gradient_3d(pareto_front, ref)
         else:
             # higher dimensional cases: recursive computation
-            for i in range(N):
+            HVdY = self._projected_hypervolume_dY(pareto_front, ref, HVdY)
+        return HVdY
+
+    def hypervolume_dY_batch(
+        self, pareto_front: np.ndarray, refs: np.ndarray, return_value: bool = False
+    ) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+        """compute `hypervolume_dY` for a sweep of reference points on the same Pareto front
+
+        If every point of the front is strictly better than a reference point `r` in all objectives, i.e.,
+        `r > pareto_front.max(axis=0)`, the hypervolume is the volume of a union of boxes [y, r], which is
+        multilinear in `r` by inclusion-exclusion, and so is its gradient. When there are more than
+        2^n_objective such reference points, both are hence computed only at the corners of the bounding box of
+        those reference points and interpolated at each of them, which is exact up to rounding.
+
+        The other reference points, e.g., for more than four objectives, are computed one by one. For more
+        than three objectives, the sweeps of the projected fronts along each axis only depend on which points
+        lie inside of the reference box, such that they are shared among the reference points that agree on
+        these points, and only the hypervolume improvements are computed for each reference point.
+
+        Args:
+            pareto_front (np.ndarray): the Pareto front of shape (n_points, n_objectives)
+            refs (np.ndarray): the reference points of shape (n_refs, n_objective)
+            return_value (bool, optional): whether to return the hypervolume values as well. Defaults to False.
+
+        Raises:
+            ValueError: if the reference points do not have as many objectives as the Pareto front
+
+        Returns:
+            Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]: the hypervolume indicator gradients of shape
+                (n_refs, n_points, n_objective), and the hypervolume values of shape (n_refs, )
+                if `return_value` is True
+        """
+        pareto_front, refs = np.atleast_2d(pareto_front), np.atleast_2d(refs)
+        if refs.shape[1] != pareto_front.shape[1]:
+            raise ValueError(
+                f"the reference points have {refs.shape[1]} objectives, but the Pareto front has {pareto_front.shape[1]}"
+            )
+        dim = refs.shape[1]
+        HVdY = np.zeros((len(refs), *pareto_front.shape))
+        value = np.zeros(len(refs))
+        # the reference points at which the hypervolume is multilinear
+        inside = np.all(refs > pareto_front.max(axis=0), axis=1)
+        if np.sum(inside) <= 2**dim:  # interpolating is not cheaper than computing each of them
+            inside[:] = False
+        else:
+            lo, hi = refs[inside].min(axis=0), refs[inside].max(axis=0)
+            hi[hi == lo] += 1
+            bits = np.array(list(product([False, True], repeat=dim)))
+            corners = np.where(bits, hi, lo)  # (2^n_objective, n_objective)
+            t = (refs[inside] - lo) / (hi - lo)
+            # the multilinear interpolation weights of the corners for each reference point
+            weights = np.prod(np.where(bits, t[:, np.newaxis], 1 - t[:, np.newaxis]), axis=2)
+            HVdY[inside] = np.einsum("rc,cij->rij", weights, [self.hypervolume_dY(pareto_front, c) for c in corners])
+            if return_value:
+                value[inside] = weights @ np.array([hypervolume(pareto_front, c) for c in corners])
+        rest = np.nonzero(~inside)[0]
+        if dim <= 3:
+            for r in rest:
+                HVdY[r] = self.hypervolume_dY(pareto_front, refs[r])
+        else:
+            # the points inside of each reference box, which determine the projected fronts of the sweeps
+            masks = np.all(pareto_front[np.newaxis] < refs[rest, np.newaxis], axis=2)
+            for mask in np.unique(masks, axis=0):
+                group = rest[np.all(masks == mask, axis=1)]
                 for k in range(dim):
-                    y_, pareto_front_, ref_, _ = self._project(k, i, pareto_front, ref)
+                    sweep = list(self._projections(k, pareto_front, refs[group[0]]))
+                    for r in group:
+                        ref_ = np.delete(refs[r], k)
+                        for i, y_, pareto_front_, _, _ in sweep:
+                            # NOTE: `-1.0` -> since we assume a minimization problem
+                            HVdY[r, i, k] = -1.0 * hypervolume_improvement(y_, pareto_front_, ref_)
+        if return_value:
+            for r in rest:
+                value[r] = hypervolume(pareto_front, refs[r])
+        return (HVdY, value) if return_value else HVdY
+
+    def _projected_hypervolume_dY(
+        self, pareto_front: np.ndarray, ref: np.ndarray, HVdY: np.ndarray, mask: np.ndarray = None
+    ) -> np.ndarray:
+        """compute the entries of `HVdY` selected by `mask` (all by default), both of shape (n_points, n_objectives),
+        as the hypervolume improvement of each point projected along each axis"""
+        for k in range(pareto_front.shape[1]):
+            for i, y_, pareto_front_, ref_, _ in self._projections(k, pareto_front, ref):
+                if mask is None or mask[i, k]:
                     # NOTE: `-1.0` -> since we assume a minimization problem
                     HVdY[i, k] = -1.0 * hypervolume_improvement(y_, pareto_front_, ref_)
         return HVdY
@@ -380,26 +928,57 @@ class HypervolumeDerivatives:
         Y: np.ndarray = None,
         YdX: np.ndarray = None,
         compute_hessian: np.ndarray = False,
+        changed: np.ndarray = None,
     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
-        """compute the objective function value, the Jacobian, and Hessian tensor"""
+        """compute the objective function value, the Jacobian, and Hessian tensor, where only the points in the
+        mask `changed` are evaluated if it is given and the other ones are taken from the previous call"""
         if not isinstance(X, np.ndarray):
             X = np.asarray(X)
         if X.shape[1] != self.n_var:
             X = X.T
         self.N = X.shape[0]  # number of points
+        previous = self._derivative_cache if changed is not None else None
+
+        def evaluate(func: callable, func_batch: callable, name: str) -> np.ndarray:
+            if previous is None:
+                return evaluate_batch(func, X, func_batch)
+            out = previous[name].copy()
+            if np.any(changed):
+                out[changed] = np.reshape(evaluate_batch(func, X[changed], func_batch), out[changed].shape)
+            return out
+
         if Y is None:  # do not evaluate the function when `Y` is provided
-            Y = np.array([self.func(x) for x in X])  # `(N, n_objective)`
+            Y = evaluate(self.func, self.func_batch, "Y")  # `(N, n_objective)`
         # Jacobians
         # `(N, n_objective, n_decision_var)`
-        YdX = np.array([self.jac(x) for x in X]) if YdX is None else YdX.copy()
-        YdX = block_diag(*YdX)  # `(N * n_objective, N * n_decision_var)` grouped by points
+        YdX = evaluate(self.jac, self.jac_batch, "YdX") if YdX is None else np.asarray(YdX)
+        YdX = YdX.reshape(self.N, self.n_obj, self.n_var)
         # Hessians
         if compute_hessian:
-            _YdX2 = np.array(
-                [self.hessian(x) for x in X]
-            )  # `(N, n_objective, n_decision_var, n_decision_var)`
-            YdX2 = np.zeros((self.N * self.n_obj, self.N * self.n_var, self.N * self.n_var))
-            for i in range(self.N):
-                idx = slice(i * self.n_var, (i + 1) * self.n_var)
-                YdX2[i * self.n_obj : (i + 1) * self.n_obj, idx, idx] = _YdX2[i, ...]
+            # `(N, n_objective, n_decision_var, n_decision_var)`
+            YdX2 = evaluate(self.hessian, self.hess_batch, "YdX2")
+            YdX2 = YdX2.reshape(self.N, self.n_obj, self.n_var, self.n_var)
         return (Y, YdX, YdX2) if compute_hessian else (Y, YdX)
+
+
+def _hessian_entries_chunk(
+    Y: np.ndarray,
+    ref: np.ndarray,
+    axis: int,
+    start: int,
+    stop: int,
+    archive: np.ndarray,
+    indices: np.ndarray,
+    values: np.ndarray,
+    offset: int,
+    HVdY: np.ndarray = None,
+):
+    """write the non-zero entries of `HVdY2` in the columns of the `axis`-th objective for a part of the sweep
+    into the shared `indices` and `values` from `offset` on (and the gradient entries of its points into the
+    shared `HVdY` if given), which is computed in a worker process"""
+    hvh = HypervolumeDerivatives(n_var=Y.shape[1], n_obj=Y.shape[1], ref=ref)
+    hvh.objective_points = np.asarray(Y)
+    rows, cols, vals = hvh._hessian_entries_axis(axis, start, stop, archive=archive, HVdY=HVdY)
+    indices[0, offset : offset + len(rows)] = rows
+    indices[1, offset : offset + len(cols)] = cols
+    values[offset : offset + len(vals)] = vals
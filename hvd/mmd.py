@@ -5,10 +5,11 @@ from typing import Dict, List, Tuple, Union
 import jax.numpy as jnp
 import numpy as np
 from jax import jacfwd, jacrev, jit
-from scipy.linalg import block_diag
+from scipy.sparse.linalg import LinearOperator
 from scipy.spatial.distance import cdist
 
 from .reference_set import ClusteredReferenceSet
+from .utils import choose_hessian_strategy, evaluate_batch
 
 # enable double-precision of JAX
 os.environ["JAX_ENABLE_X64"] = "True"
@@ -31,6 +32,45 @@ def laplace(x: np.ndarray, y: np.ndarray, theta: float = 1.0) -> float:
     return jnp.exp(-theta * jnp.sum((jnp.abs(x - y))))
 
 
+def _hessian_footprints(N: int, dim_x: int, dim_y: int) -> Dict[str, int]:
+    """the estimated peak memory in bytes of the Hessian w.r.t. the decision variables, which is either
+    assembled as a dense matrix or kept as a `LinearOperator`"""
+    N, dim_x, dim_y = int(N), int(dim_x), int(dim_y)
+    # the dense `MMDdY2` and the objective derivatives
+    base = 8 * (N * dim_y) ** 2 + 8 * N * dim_y * dim_x * (dim_x + 2)
+    return {"dense": base + 8 * (N * dim_x) ** 2, "matrix-free": base + 8 * N * dim_x**2}
+
+
+def _chain_rule_hessian(
+    MMDdY: np.ndarray, MMDdY2: np.ndarray, YdX: np.ndarray, YdX2: np.ndarray, strategy: str = "dense"
+) -> Union[np.ndarray, LinearOperator]:
+    """the Hessian w.r.t. the decision variables from the one w.r.t. the objective points, which is assembled
+    block-wise as a dense matrix, or a `LinearOperator` of Hessian-vector products if `strategy` is "matrix-free"
+    """
+    N, dim_y, dim_x = YdX.shape
+    blocks = np.einsum("ij,ij...->i...", MMDdY, YdX2)
+    if strategy == "matrix-free":
+
+        def matvec(v: np.ndarray) -> np.ndarray:
+            v = np.reshape(v, (N, dim_x))
+            w = (MMDdY2 @ np.einsum("ijk,ik->ij", YdX, v).ravel()).reshape(N, dim_y)
+            return (np.einsum("ijk,ij->ik", YdX, w) + np.einsum("ikl,il->ik", blocks, v)).ravel()
+
+        return LinearOperator((N * dim_x, N * dim_x), matvec=matvec, dtype=float)
+
+    MMDdX2 = np.zeros((N * dim_x, N * dim_x))
+    for l in range(N):
+        for m in range(l, N):
+            r, c = slice(m * dim_y, (m + 1) * dim_y), slice(l * dim_y, (l + 1) * dim_y)
+            rr, cc = slice(m * dim_x, (m + 1) * dim_x), slice(l * dim_x, (l + 1) * dim_x)
+            MMDdX2[rr, cc] = YdX[m].T @ MMDdY2[r, c] @ YdX[l]
+            MMDdX2[cc, rr] = MMDdX2[rr, cc].T
+    # add the diagonal blocks in place instead of allocating a block-diagonal matrix
+    for i, block in enumerate(blocks):
+        MMDdX2[i * dim_x : (i + 1) * dim_x, i * dim_x : (i + 1) * dim_x] += block
+    return MMDdX2
+
+
 class MMD:
     """Maximum Mean Discrepancy (MMD) indicator"""
 
@@ -44,6 +84,10 @@ class MMD:
         hessian: callable = None,
         kernel: callable = rational_quadratic,
         theta: float = 1.0,
+        memory_limit: int = None,
+        func_batch: callable = None,
+        jac_batch: callable = None,
+        hess_batch: callable = None,
     ) -> None:
         """Maximum Mean Discrepancy (MMD) indicator for multi-objective optimization
 
@@ -56,13 +100,30 @@ class MMD:
             hessian (callable, optional): the Hessian of the objective function. Defaults to None.
             kernel (callable, optional): the kernel function. Defaults to `rational_quadratic`.
             theta (float, optional): length-scale of the kernel. Defaults to 1.0.
+            memory_limit (int, optional): the memory budget in bytes for computing the Hessian, under which
+                it is either a dense matrix ("dense") or a `LinearOperator` ("matrix-free"). The chosen strategy
+                and its estimated peak memory are stored in `hessian_strategy` and `hessian_memory`.
+                Defaults to None, i.e., no budget.
+            func_batch (callable, optional): the batched objective function, which takes decision points of
+                shape (N, `n_var`) and returns an array of shape (N, `n_obj`); it is preferred over `func`.
+                Defaults to None.
+            jac_batch (callable, optional): the batched Jacobian, returning an array of shape
+                (N, `n_obj`, `n_var`). Defaults to None.
+            hess_batch (callable, optional): the batched Hessian, returning an array of shape
+                (N, `n_obj`, `n_var`, `n_var`). Defaults to None.
         """
         self.func = func if func is not None else lambda x: x
         self.jac = jac if jac is not None else lambda x: np.diag(np.ones(len(x)))
         self.hessian = hessian if hessian is not None else lambda x: np.zeros((len(x), len(x), len(x)))
+        self.func_batch = func_batch
+        self.jac_batch = jac_batch
+        self.hess_batch = hess_batch
         self.n_var = int(n_var)
         self.n_obj = int(n_obj)
         self.theta: float = theta  # kernel's length-scale
+        self.memory_limit = memory_limit
+        self.hessian_strategy: str = None
+        self.hessian_memory: int = None
         self.ref = ref
         self.N = self.ref.shape[0]
         # kernel for correlations between `ref` and `Y`
@@ -85,7 +146,7 @@ class MMD:
         if Y is None:
             assert X is not None
             assert self.func is not None
-            Y = np.array([self.func(x) for x in X])
+            Y = evaluate_batch(self.func, X, self.func_batch)
         RR = cdist(self.ref, self.ref, metric=self.k)
         YY = cdist(Y, Y, metric=self.k)
         RY = cdist(self.ref, Y, metric=self.k)
@@ -125,8 +186,10 @@ class MMD:
         Y, YdX, YdX2, MMDdY, MMDdX = out["Y"], out["YdX"], out["YdX2"], out["MMDdY"], out["MMDdX"]
         N, dim_y = Y.shape
         dim_x = self.n_var
+        self.hessian_strategy, self.hessian_memory = choose_hessian_strategy(
+            _hessian_footprints(N, dim_x, dim_y), self.memory_limit
+        )
         MMDdY2 = np.zeros((N * dim_y, N * dim_y))
-        MMDdX2 = np.zeros((N * dim_x, N * dim_x))
         for l in range(N):
             for m in range(l, N):
                 # compute MMDdY2
@@ -139,11 +202,7 @@ class MMD:
                     term1 = np.sum([self.k_dx2(Y[l], Y[i]) for i in range(N) if i != l], axis=0)
                     term2 = np.sum([self.k_dx2(Y[l], self.ref[i]) for i in range(self.N)], axis=0)
                     MMDdY2[r, c] = 2 * (term1 / N**2 - term2 / (N * self.N))
-                # compute MMDdX2
-                rr, cc = slice(m * dim_x, (m + 1) * dim_x), slice(l * dim_x, (l + 1) * dim_x)
-                MMDdX2[rr, cc] = YdX[m].T @ MMDdY2[r, c] @ YdX[l]
-                MMDdX2[cc, rr] = MMDdX2[rr, cc].T
-        MMDdX2 += block_diag(*np.einsum("ij,ij...->i...", MMDdY, YdX2))
+        MMDdX2 = _chain_rule_hessian(MMDdY, MMDdY2, YdX, YdX2, self.hessian_strategy)
         return dict(MMDdX2=MMDdX2, MMDdY2=MMDdY2, MMDdX=MMDdX, MMDdY=MMDdY)
 
     def _compute_objective_derivatives(
@@ -151,12 +210,13 @@ class MMD:
     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """compute the objective function value, the Jacobian, and Hessian tensor"""
         if Y is None:
-            Y = np.array([self.func(x) for x in X])  # `(N, n_objective)`
+            Y = evaluate_batch(self.func, X, self.func_batch)  # `(N, n_objective)`
         assert Y.shape[1] == self.n_obj
         # Jacobians of the objective function
-        YdX = np.array([self.jac(x) for x in X])  # `(N, n_objective, n_decision_var)`
+        YdX = evaluate_batch(self.jac, X, self.jac_batch)  # `(N, n_objective, n_decision_var)`
         # Hessians of the objective function
-        YdX2 = np.array([self.hessian(x) for x in X])  # `(N, n_objective, n_decision_var, n_decision_var)`
+        # `(N, n_objective, n_decision_var, n_decision_var)`
+        YdX2 = evaluate_batch(self.hessian, X, self.hess_batch)
         return Y, YdX, YdX2
 
     def _check_X(self, X: Union[np.ndarray, List]) -> np.ndarray:
@@ -181,6 +241,10 @@ class MMDMatching:
         kernel: callable = rbf,
         theta: float = 1.0,
         beta: float = 0.5,
+        memory_limit: int = None,
+        func_batch: callable = None,
+        jac_batch: callable = None,
+        hess_batch: callable = None,
     ) -> None:
         """Maximum Mean Discrepancy (MMD) indicator for multi-objective optimization
 
@@ -195,15 +259,32 @@ class MMDMatching:
             theta (float, optional): length-scale of the kernel. Defaults to 1.0.
             beta (float, optional): coefficient to scale the RKHS norm of the approximation set.
                 Defaults to 0.5.
+            memory_limit (int, optional): the memory budget in bytes for computing the Hessian, under which
+                it is either a dense matrix ("dense") or a `LinearOperator` ("matrix-free"). The chosen strategy
+                and its estimated peak memory are stored in `hessian_strategy` and `hessian_memory`.
+                Defaults to None, i.e., no budget.
+            func_batch (callable, optional): the batched objective function, which takes decision points of
+                shape (N, `n_var`) and returns an array of shape (N, `n_obj`); it is preferred over `func`.
+                Defaults to None.
+            jac_batch (callable, optional): the batched Jacobian, returning an array of shape
+                (N, `n_obj`, `n_var`). Defaults to None.
+            hess_batch (callable, optional): the batched Hessian, returning an array of shape
+                (N, `n_obj`, `n_var`, `n_var`). Defaults to None.
         """
         if isinstance(ref, np.ndarray):
             ref = ClusteredReferenceSet(ref)
         self.func = func if func is not None else lambda x: x
         self.jac = jac if jac is not None else lambda x: np.diag(np.ones(len(x)))
         self.hessian = hessian if hessian is not None else lambda x: np.zeros((len(x), len(x), len(x)))
+        self.func_batch = func_batch
+        self.jac_batch = jac_batch
+        self.hess_batch = hess_batch
         self.n_decision_var = int(n_var)
         self.n_objective = int(n_obj)
         self.theta: float = theta  # kernel's length-scale
+        self.memory_limit = memory_limit
+        self.hessian_strategy: str = None
+        self.hessian_memory: int = None
         self.ref = ref
         self.N = self.ref.N
         self.k = partial(kernel, theta=self.theta)
@@ -226,7 +307,7 @@ class MMDMatching:
         if Y is None:
             assert X is not None
             assert self.func is not None
-            Y = np.array([self.func(x) for x in X])
+            Y = evaluate_batch(self.func, X, self.func_batch)
         self.ref.match(Y)
         return (
             self.beta * cdist(Y, Y, metric=self.k).mean()
@@ -297,8 +378,10 @@ class MMDMatching:
         Y, YdX, YdX2, MMDdY, MMDdX = out["Y"], out["YdX"], out["YdX2"], out["MMDdY"], out["MMDdX"]
         N, dim_y = Y.shape
         dim_x = self.n_decision_var
+        self.hessian_strategy, self.hessian_memory = choose_hessian_strategy(
+            _hessian_footprints(N, dim_x, dim_y), self.memory_limit
+        )
         MMDdY2 = np.zeros((N * dim_y, N * dim_y))
-        MMDdX2 = np.zeros((N * dim_x, N * dim_x))
         for l in range(N):
             for m in range(l, N):
                 # compute MMDdY2
@@ -311,11 +394,7 @@ class MMDMatching:
                     term1 = np.sum([self.k_dx2(Y[l], Y[i]) for i in range(N) if i != l], axis=0) / N**2
                     term2 = self.k_dx2(Y[l], self.ref.medoids[l]) / N
                     MMDdY2[r, c] = 2 * (self.beta * term1 - term2)
-                # compute MMDdX2
-                rr, cc = slice(m * dim_x, (m + 1) * dim_x), slice(l * dim_x, (l + 1) * dim_x)
-                MMDdX2[rr, cc] = YdX[m].T @ MMDdY2[r, c] @ YdX[l]
-                MMDdX2[cc, rr] = MMDdX2[rr, cc].T
-        MMDdX2 += block_diag(*np.einsum("ij,ij...->i...", MMDdY, YdX2))
+        MMDdX2 = _chain_rule_hessian(MMDdY, MMDdY2, YdX, YdX2, self.hessian_strategy)
         return dict(MMDdX2=MMDdX2, MMDdY2=MMDdY2, MMDdX=MMDdX, MMDdY=MMDdY)
 
     def _compute_objective_derivatives(
@@ -323,13 +402,14 @@ class MMDMatching:
     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """compute the objective function value, the Jacobian, and Hessian tensor"""
         if Y is None:
-            Y = np.array([self.func(x) for x in X])  # `(N, n_objective)`
+            Y = evaluate_batch(self.func, X, self.func_batch)  # `(N, n_objective)`
         assert Y.shape[1] == self.n_objective
         # Jacobians of the objective function
         #  of shape `(N, n_objective, n_decision_var)`
-        YdX = np.array([self.jac(x) for x in X]) if jacobian is None else jacobian
+        YdX = evaluate_batch(self.jac, X, self.jac_batch) if jacobian is None else jacobian
         # Hessians of the objective function
-        YdX2 = np.array([self.hessian(x) for x in X])  # `(N, n_objective, n_decision_var, n_decision_var)`
+        # `(N, n_objective, n_decision_var, n_decision_var)`
+        YdX2 = evaluate_batch(self.hessian, X, self.hess_batch)
         return Y, YdX, YdX2
 
     def _check_X(self, X: Union[np.ndarray, List]) -> np.ndarray:
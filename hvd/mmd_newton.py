@@ -75,6 +75,9 @@ class MMDNewton:
         verbose: bool = True,
         metrics: Dict[str, Callable] = dict(),
         preconditioning: bool = False,
+        func_batch: Callable = None,
+        jac_batch: Callable = None,
+        hess_batch: Callable = None,
         **kwargs,
     ):
         """
@@ -106,6 +109,13 @@ class MMDNewton:
             xtol (float, optional): absolute distance in the approximation set between consecutive iterations
                 that is used to determine convergence. Defaults to 1e-3.
             verbose (bool, optional): verbosity of the output. Defaults to True.
+            func_batch (callable, optional): the batched objective function, which takes points of shape
+                (N, dim) and returns an array of shape (N, n_objective); it is preferred over `func`.
+                Defaults to None.
+            jac_batch (callable, optional): the batched Jacobian, returning an array of shape
+                (N, n_objective, dim). Defaults to None.
+            hess_batch (callable, optional): the batched Hessian, returning an array of shape
+                (N, n_objective, dim, dim). Defaults to None.
         """
         self.dim_p: int = n_var
         self.n_obj: int = n_obj
@@ -114,10 +124,32 @@ class MMDNewton:
         self.xu: np.ndarray = xu
         self.ref: ClusteredReferenceSet = ref  # TODO: we should pass ref to the indicator directly
         self._check_constraints(h, g)
-        self.state = State(self.dim_p, self.n_eq, self.n_ieq, func, jac, h=h, h_jac=h_jac, g=g, g_jac=g_jac)
+        self.state = State(
+            self.dim_p,
+            self.n_eq,
+            self.n_ieq,
+            func,
+            jac,
+            h=h,
+            h_jac=h_jac,
+            g=g,
+            g_jac=g_jac,
+            func_batch=func_batch,
+            jac_batch=jac_batch,
+        )
         # TODO: move indicator out of this class
         self.indicator = MMDMatching(
-            self.dim_p, self.n_obj, self.ref, func, jac, hessian, theta=1.0 / N, beta=0.25
+            self.dim_p,
+            self.n_obj,
+            self.ref,
+            func,
+            jac,
+            hessian,
+            theta=1.0 / N,
+            beta=0.25,
+            func_batch=func_batch,
+            jac_batch=jac_batch,
+            hess_batch=hess_batch,
         )
         self._initialize(X0)
         self._set_logging(verbose)
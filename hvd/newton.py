@@ -5,9 +5,10 @@ from copy import deepcopy
 from typing import Callable, Dict, List, Tuple, Union
 
 import numpy as np
-from scipy.linalg import block_diag, solve
-from scipy.sparse import csc_matrix
-from scipy.sparse.linalg import spsolve
+from scipy.linalg import LinAlgWarning, block_diag, solve, solve_banded
+from scipy.sparse import block_diag as sparse_block_diag
+from scipy.sparse import bmat, coo_matrix, csc_matrix, csr_matrix, issparse
+from scipy.sparse.linalg import MatrixRankWarning, spsolve
 from scipy.spatial.distance import cdist
 
 from .base import State
@@ -40,6 +41,48 @@ def Nd_vector_to_matrix(
     return X
 
 
+def solve_sparse_banded(A: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """solve `A x = b` with a banded LU solver, where the bandwidths are read from the non-zero entries of `A`
+
+    Args:
+        A (np.ndarray): a dense or sparse matrix of shape (n, n)
+        b (np.ndarray): the right-hand side of shape (n, )
+
+    Returns:
+        np.ndarray: the solution of shape (n, )
+    """
+    A = coo_matrix(A)
+    rows, cols = A.row, A.col
+    lower, upper = max(0, np.max(rows - cols, initial=0)), max(0, np.max(cols - rows, initial=0))
+    ab = np.zeros((lower + upper + 1, A.shape[1]))
+    np.add.at(ab, (upper + rows - cols, cols), A.data)
+    return solve_banded((lower, upper), ab, np.ravel(b))
+
+
+def solve_front_banded(A: np.ndarray, b: np.ndarray, band: np.ndarray, blocks: List[np.ndarray]) -> np.ndarray:
+    """solve `A x = b`, where the variables in `band` only couple with each other and form a banded system
+    in this order, and each of `blocks` is a group of variables decoupled from all the others
+
+    The blocks are solved on their own in the least-squares sense, which gives a zero step for a zero block.
+
+    Args:
+        A (np.ndarray): a dense or sparse matrix of shape (n, n)
+        b (np.ndarray): the right-hand side of shape (n, )
+        band (np.ndarray): the indices of the banded variables
+        blocks (List[np.ndarray]): the indices of each decoupled group of variables
+
+    Returns:
+        np.ndarray: the solution of shape (n, )
+    """
+    A, b = csr_matrix(A), np.ravel(b)
+    x = np.zeros(len(b))
+    if len(band) > 0:
+        x[band] = solve_sparse_banded(A[band][:, band], b[band])
+    for v in blocks:
+        x[v] = np.linalg.lstsq(A[v][:, v].toarray(), b[v], rcond=None)[0]
+    return x
+
+
 class HVN:
     """Hypervolume Newton method
 
@@ -69,6 +112,10 @@ class HVN:
         verbose: bool = True,
         metrics: Dict[str, Callable] = dict(),
         preconditioning: bool = False,
+        sparse: bool = False,
+        func_batch: Callable = None,
+        jac_batch: Callable = None,
+        hess_batch: Callable = None,
     ):
         self.dim_p: int = n_var  # the number of primal variables
         self.n_obj: int = n_obj  # the number of objectives
@@ -78,9 +125,35 @@ class HVN:
         self.ref: np.ndarray = ref
         self._check_constraints(h, g)
         self.state: State = State(
-            self.dim_p, self.n_eq, self.n_ieq, func, jac, h, h_jac, h_hessian, g, g_jac, g_hessian
+            self.dim_p,
+            self.n_eq,
+            self.n_ieq,
+            func,
+            jac,
+            h,
+            h_jac,
+            h_hessian,
+            g,
+            g_jac,
+            g_hessian,
+            func_batch=func_batch,
+            jac_batch=jac_batch,
+        )
+        # with `sparse`, the Hessian is assembled and factorized as a sparse matrix; for two objectives, it is
+        # block-tridiagonal w.r.t. the points sorted along the front, such that it is always assembled from the
+        # non-zero entries of `HVdY2` and solved as a banded system
+        self.indicator = HypervolumeDerivatives(
+            self.dim_p,
+            self.n_obj,
+            ref,
+            func,
+            jac,
+            hessian,
+            sparse=sparse or self.n_obj == 2,
+            func_batch=func_batch,
+            jac_batch=jac_batch,
+            hess_batch=hess_batch,
         )
-        self.indicator = HypervolumeDerivatives(self.dim_p, self.n_obj, ref, func, jac, hessian)
         self._initialize(X0)
         self._set_logging(verbose)
         self.xtol: float = xtol
@@ -174,8 +247,6 @@ class HVN:
         """
         # check for anomalies in `X` and `Y`
         self._check_points_uniqueness()
-        # first compute the current indicator value
-        self._compute_indicator_value()
         # partition the approximation set to by feasibility
         feasible_mask = self.state.is_feasible()
         feasible_idx, infeasible_idx = np.nonzero(feasible_mask)[0], np.nonzero(~feasible_mask)[0]
@@ -190,19 +261,30 @@ class HVN:
         self.step = np.zeros((self.N, self.dim))
         self.step_size = np.ones(self.N)
         self.R = np.zeros((self.N, self.dim))
-        for idx in partitions.values():
+        accepted = []
+        for k, idx in partitions.items():
             # compute Newton step
-            newton_step, R = self._compute_netwon_step(self.state[idx])
+            newton_step, R, value = self._compute_netwon_step(self.state[idx])
+            # the first layer contains all non-dominated points, so its hypervolume is the current indicator value
+            if k == 0:
+                self.curr_indicator_value = value
             # constrain the search steps within the search box
             newton_step, max_step_size = self._handle_box_constraint(newton_step, self.state[idx])
             self.step[idx, :] = newton_step
             self.R[idx, :] = R
             # backtracking line search with Armijo's condition for each layer
-            self.step_size[idx] = self._backtracking_line_search(
+            self.step_size[idx], state = self._backtracking_line_search(
                 self.state[idx], newton_step, R, max_step_size
             )
-        # Newton iteration and evaluation
-        self.state.update(self.state.X + self.step * self.step_size.reshape(-1, 1))
+            accepted.append((idx, state))
+        # Newton iteration; the points accepted by the line search are already evaluated
+        X = self.state.X + self.step * self.step_size.reshape(-1, 1)
+        for idx, state in accepted:
+            if state is None:
+                state = self.state[idx]
+                state.update(X[idx])
+                self.state.n_jac_evals += state.n_jac_evals
+            self.state.assign(idx, state)
 
     def log(self):
         # TODO: maybe we should log the initial population
@@ -251,44 +333,78 @@ class HVN:
                 R[i, self.dim_p :][k] = cstr_value[i, k]
         return R, dH, active_indices
 
-    def _compute_netwon_step(self, state: State) -> Tuple[np.ndarray, np.ndarray]:
-        grad, DR = self.indicator.compute_derivatives(X=state.primal, Y=state.Y, YdX=state.J)
+    def _compute_netwon_step(self, state: State) -> Tuple[np.ndarray, np.ndarray, float]:
+        value, grad, DR = self.indicator.compute_value_and_derivatives(X=state.primal, Y=state.Y, YdX=state.J)
         R, H, idx = self._compute_R(state, grad=grad)
         # in case the Hessian is not NSD
         if self.preconditioning:
-            DR = -1.0 * precondition_hessian(-1.0 * DR)
+            DR = -1.0 * precondition_hessian(-1.0 * (DR.toarray() if issparse(DR) else DR))
         if self._constrained:
-            H = block_diag(*H)  # (N * p, N * dim), `p` is the number of active constraints
             B = state.cstr_hess
-            M = block_diag(*[np.einsum("i...,i", B[i, k], state.dual[i, k]) for i, k in enumerate(idx)])
-            Z = np.zeros((len(H), len(H)))
-            DR = np.r_[np.c_[DR + M, H.T], np.c_[H, Z]]
+            M = [np.einsum("i...,i", B[i, k], state.dual[i, k]) for i, k in enumerate(idx)]
+            if issparse(DR):
+                H = sparse_block_diag(H, format="csc")  # (N * p, N * dim), `p` is the number of active constraints
+                DR = bmat([[DR + sparse_block_diag(M), H.T], [H, None]])
+            else:
+                H = block_diag(*H)  # (N * p, N * dim), `p` is the number of active constraints
+                M = block_diag(*M)
+                Z = np.zeros((len(H), len(H)))
+                DR = np.r_[np.c_[DR + M, H.T], np.c_[H, Z]]
         # the vector-format of R
         R_vec = matrix_to_Nd_vector(R, self.dim_p, idx)
         with warnings.catch_warnings():
             warnings.filterwarnings("error")
             try:
-                newton_step_ = -1 * spsolve(csc_matrix(DR), csc_matrix(R_vec))
-            except:  # if DR is singular, then use the pseudoinverse
+                if self.n_obj == 2 and not self.preconditioning:
+                    # each point on the front only couples with its neighbours
+                    newton_step_ = -1 * solve_front_banded(DR, R_vec, *self._front_order(state, idx))
+                else:
+                    newton_step_ = -1 * spsolve(csc_matrix(DR), csc_matrix(R_vec))
+            # the warnings are raised as errors in this context
+            except (np.linalg.LinAlgError, LinAlgWarning, MatrixRankWarning):
+                # if DR is singular, then use the pseudoinverse
+                DR = DR.toarray() if issparse(DR) else DR
                 newton_step_ = -1 * np.linalg.lstsq(DR, R_vec, rcond=None)[0].ravel()
         # convert the vector-format of the newton step to matrix format
         newton_step = Nd_vector_to_matrix(newton_step_.ravel(), state.N, self.dim, self.dim_p, idx)
-        return newton_step, R
-
-    def _compute_indicator_value(self):
-        self.curr_indicator_value = self.indicator.compute(Y=self.state.Y)
+        return newton_step, R, value
+
+    def _front_order(self, state: State, active_indices: np.ndarray) -> Tuple[np.ndarray, List[np.ndarray]]:
+        """group the variables of the Newton system by point, each point's primal variables followed by its
+        active dual variables, into those of the non-dominated points sorted along the first objective, which
+        only couple with their neighbours, and those of each other point, whose Hessian block is zero such that
+        they only couple with themselves via the constraints"""
+        N, D = state.N, state.N * self.dim_p
+        variables = np.arange(D).reshape(N, -1).tolist()
+        if active_indices is not None:
+            offsets = np.r_[0, np.cumsum(np.sum(active_indices, axis=1))]
+            variables = [v + list(range(D + offsets[i], D + offsets[i + 1])) for i, v in enumerate(variables)]
+        # the non-dominated points in the reference box, for which the indicator has just been computed
+        front = self.indicator._nondominated_indices
+        front = front[np.argsort(state.Y[front, 0], kind="stable")]
+        band = np.array([k for i in front for k in variables[i]], dtype=int)
+        return band, [np.array(variables[i], dtype=int) for i in np.setdiff1d(np.arange(N), front)]
 
     def _backtracking_line_search(
         self, state: State, step: np.ndarray, R: np.ndarray, max_step_size: float = 1
-    ) -> float:
-        """backtracking line search with Armijo's condition"""
+    ) -> Tuple[float, State]:
+        """backtracking line search with Armijo's condition
+
+        Returns:
+            Tuple[float, State]: the step size and the state evaluated at it, which is None if
+                the step size is not evaluated during the search
+        """
         c1 = 1e-5
         if np.any(np.isclose(np.median(step[:, : self.dim_p]), np.finfo(np.double).resolution)):
-            return max_step_size
+            return max_step_size, None
+
+        trials = {}
 
         def phi_func(alpha: float) -> float:
             state_ = deepcopy(state)
             state_.update(state.X + alpha * step)
+            self.state.n_jac_evals += state_.n_jac_evals - state.n_jac_evals
+            trials[alpha] = state_
             R = self._compute_R(state_)[0]
             return np.linalg.norm(R)
 
@@ -315,7 +431,7 @@ class HVN:
         else:
             self.logger.warn("backtracking line search failed")
         step_size = s[-1]
-        return step_size
+        return step_size, trials.get(step_size)
 
     def _handle_box_constraint(self, step: np.ndarray, state: State) -> Tuple[np.ndarray, np.ndarray]:
         primal_vars, step_primal = state.primal, step[:, : self.dim_p]
@@ -350,7 +466,9 @@ class HVN:
         if len(drop_idx) > 0:
             self.logger.info(f"{len(drop_idx)} points are removed due to duplication")
         idx = list(set(range(self.N)) - drop_idx)
+        n_jac_evals = self.state.n_jac_evals
         self.state = self.state[idx]
+        self.state.n_jac_evals = n_jac_evals
         self.N = self.state.N
 
 
@@ -388,6 +506,9 @@ class DpN:
         eta=None,
         Y_label=None,
         preconditioning: bool = False,
+        func_batch: Callable = None,
+        jac_batch: Callable = None,
+        hess_batch: Callable = None,
     ):
         """
         Args:
@@ -418,6 +539,13 @@ class DpN:
             xtol (float, optional): absolute distance in the approximation set between consecutive iterations
                 that is used to determine convergence. Defaults to 1e-3.
             verbose (bool, optional): verbosity of the output. Defaults to True.
+            func_batch (callable, optional): the batched objective function, which takes points of shape
+                (N, dim) and returns an array of shape (N, n_objective); it is preferred over `func`.
+                Defaults to None.
+            jac_batch (callable, optional): the batched Jacobian, returning an array of shape
+                (N, n_objective, dim). Defaults to None.
+            hess_batch (callable, optional): the batched Hessian, returning an array of shape
+                (N, n_objective, dim, dim). Defaults to None.
         """
         assert type in ["gd", "igd", "deltap"]
         self.type = type
@@ -429,10 +557,22 @@ class DpN:
         self.preconditioning: bool = preconditioning
         self._check_constraints(h, g)
         self.state = State(
-            self.dim_p, self.n_eq, self.n_ieq, func, jac, h, h_jac, h_hessian, g, g_jac, g_hessian
+            self.dim_p,
+            self.n_eq,
+            self.n_ieq,
+            func,
+            jac,
+            h,
+            h_jac,
+            h_hessian,
+            g,
+            g_jac,
+            g_hessian,
+            func_batch=func_batch,
+            jac_batch=jac_batch,
         )
         self._initialize(x0)
-        self._set_indicator(ref, func, jac, hessian)
+        self._set_indicator(ref, func, jac, hessian, func_batch, jac_batch, hess_batch)
         self._set_logging(verbose)
         # parameters controlling stop criteria
         self.xtol = xtol
@@ -487,10 +627,18 @@ class DpN:
         self.iter_count: int = 0
 
     def _set_indicator(
-        self, ref: Union[np.ndarray, Dict[int, np.ndarray]], func: Callable, jac: Callable, hessian: Callable
+        self,
+        ref: Union[np.ndarray, Dict[int, np.ndarray]],
+        func: Callable,
+        jac: Callable,
+        hessian: Callable,
+        func_batch: Callable = None,
+        jac_batch: Callable = None,
+        hess_batch: Callable = None,
     ):
-        self._gd = GenerationalDistance(ref, func, jac, hessian)
-        self._igd = InvertedGenerationalDistance(ref, func, jac, hessian, cluster_matching=True)
+        batch = dict(func_batch=func_batch, jac_batch=jac_batch, hess_batch=hess_batch)
+        self._gd = GenerationalDistance(ref, func, jac, hessian, **batch)
+        self._igd = InvertedGenerationalDistance(ref, func, jac, hessian, cluster_matching=True, **batch)
 
     def _set_logging(self, verbose):
         """parameters for logging the history"""
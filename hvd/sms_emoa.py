@@ -4,7 +4,6 @@ from pymoo.algorithms.base.genetic import GeneticAlgorithm
 from pymoo.core.population import Population
 from pymoo.core.survival import Survival
 from pymoo.indicators.hv.exact import DynamicHypervolume
-from pymoo.indicators.hv.exact_2d import ExactHypervolume2D
 from pymoo.indicators.hv.monte_carlo import ApproximateMonteCarloHypervolume
 from pymoo.operators.crossover.sbx import SBX
 from pymoo.operators.mutation.pm import PM
@@ -16,6 +15,7 @@ from pymoo.util.nds.non_dominated_sorting import NonDominatedSorting
 from pymoo.util.normalization import normalize
 
 from .exact import ExactHypervolume
+from .hypervolume import DynamicHypervolume2D, LimitSetHypervolume3D
 
 # NOTE: speedup the MC hypervolume contribution with `numba`
 
@@ -135,8 +135,11 @@ class LeastHypervolumeContributionSurvival(Survival):
                 # choose the suitable hypervolume method
                 clazz = ExactHypervolume
                 if n_obj == 2:
-                    clazz = ExactHypervolume2D
-                elif n_obj >= 3:
+                    clazz = DynamicHypervolume2D
+                elif n_obj == 3:
+                    # exact contributions, of which only the affected ones are recomputed after each deletion
+                    clazz = LimitSetHypervolume3D
+                elif n_obj > 3:
                     clazz = ApproximateMonteCarloHypervolume
 
                 # finally do the computation
@@ -175,6 +175,45 @@ def get_non_dominated(pareto_front: np.ndarray, return_index: bool = False, weak
     return pareto_indices if return_index else pareto_front
 
 
+def evaluate_batch(func: callable, X: np.ndarray, func_batch: callable = None) -> np.ndarray:
+    """Evaluate a function at each row of `X`, preferring its batched version if it is given
+
+    Args:
+        func (callable): the function of a single point
+        X (np.ndarray): the points of shape (N, dim)
+        func_batch (callable, optional): the function of all points at once, which returns the values of
+            `func` stacked along the first axis. Defaults to None.
+
+    Returns:
+        np.ndarray: the values of shape (N, ...)
+    """
+    if func_batch is not None:
+        return np.asarray(func_batch(X))
+    return np.array([func(x) for x in X])
+
+
+def choose_hessian_strategy(footprints: Dict[str, int], memory_limit: int = None) -> Tuple[str, int]:
+    """Choose the first strategy to assemble a Hessian whose estimated peak memory is within the budget
+
+    Args:
+        footprints (Dict[str, int]): the estimated peak memory in bytes of each strategy, by preference
+        memory_limit (int, optional): the memory budget in bytes; None takes the first strategy. Defaults to None.
+
+    Raises:
+        MemoryError: if none of the strategies fits in `memory_limit`
+
+    Returns:
+        Tuple[str, int]: the strategy and its estimated peak memory
+    """
+    for strategy, footprint in footprints.items():
+        if memory_limit is None or footprint <= memory_limit:
+            return strategy, int(footprint)
+    raise MemoryError(
+        f"the Hessian needs at least {int(min(footprints.values()))} bytes ({min(footprints, key=footprints.get)}), "
+        f"which exceeds `memory_limit` = {memory_limit} bytes"
+    )
+
+
 def set_bounds(bound, dim):
     if isinstance(bound, str):
         bound = eval(bound)
@@ -1,9 +1,12 @@
 import sys
 
 import numpy as np
+from scipy.sparse import issparse
 
 sys.path.insert(0, "./")
 from hvd import HypervolumeDerivatives
+from hvd.hypervolume_derivatives import _staircase_order
+from hvd.newton import HVN
 
 np.random.seed(42)
 
@@ -64,3 +67,103 @@ def test_2D_case2():
         AD = hvh.compute_automatic_differentiation(X)
         assert np.all(np.isclose(out["HVdX"], AD["HVdX"]))
         assert np.all(np.isclose(out["HVdX2"], AD["HVdX2"]))
+
+
+def test_2D_closed_form_hessian():
+    rng = np.random.default_rng(42)
+    hvh = HypervolumeDerivatives(2, 2, np.array([5, 5]), minimization=True)
+    for _ in range(10):
+        # points on a front and a few dominated ones
+        Y = rng.random((15, 2)) * 4
+        Y[:, 1] = 4 - Y[:, 0] + (rng.random(15) < 0.2) * rng.random(15)
+        hvh._compute_gradient(Y)
+        H, H_ = np.zeros((30, 30)), np.zeros((30, 30))
+        rows, cols, values = hvh._hessian_entries_2d()
+        H[rows, cols] = values
+        rows, cols, values = hvh._hessian_entries()
+        H_[rows, cols] = values
+        assert np.all(H == H_)
+
+
+def test_2D_jacobian_evaluations():
+    calls = []
+
+    def jac(x):
+        calls.append(1)
+        return MOP1_Jacobian(x)
+
+    hvh = HypervolumeDerivatives(
+        n_var=2, n_obj=2, ref=np.array([20, 20]), func=MOP1, jac=jac, hessian=MOP1_Hessian
+    )
+    hvh._compute_hessian(np.random.rand(5, 2))
+    assert len(calls) == 5
+
+    calls.clear()
+    p = np.linspace(0, 2, 10)
+    opt = HVN(
+        n_var=2,
+        n_obj=2,
+        ref=np.array([20, 20]),
+        func=MOP1,
+        jac=jac,
+        hessian=MOP1_Hessian,
+        N=10,
+        X0=np.c_[p, p - 2],
+        xl=-2,
+        xu=2,
+        max_iters=3,
+        verbose=False,
+    )
+    opt.run()
+    # the points accepted in the line search are not evaluated again
+    assert len(calls) == opt.state.n_jac_evals
+    assert len(calls) < 10 * (1 + 2 * 3)
+
+
+def test_2D_hessian_outside_reference():
+    hvh = HypervolumeDerivatives(2, 2, np.array([5, 5]), minimization=True)
+    # two points outside of the reference box, one of which dominates a point inside of it in `y_1`
+    Y = np.array([[1, 4], [2, 3], [3, 2], [6, 0.5], [0.5, 5.5], [4, 1]], dtype=float)
+    out = hvh._compute_hessian(Y)
+    AD = hvh.compute_automatic_differentiation(Y)
+    assert np.allclose(out["HVdY"], np.ravel(AD["HVdY"]))
+    assert np.allclose(out["HVdY2"], AD["HVdY2"])
+    assert np.all(out["HVdY2"][6:10] == 0) and np.all(out["HVdY2"][:, 6:10] == 0)
+
+
+def test_2D_hessian_duplicated_points():
+    hvh = HypervolumeDerivatives(2, 2, np.array([5, 5]), minimization=True)
+    Y = np.array([[2, 3], [1, 4], [2, 3], [3, 1], [1, 4]], dtype=float)
+    H = hvh._compute_hessian(Y)["HVdY2"]
+    grad = hvh._derivative_cache["HVdY"]
+    assert np.array_equal(H, H.T)
+    # breaking the ties along the staircase order keeps the order, in which the gradient is affine in `Y`
+    # with the Hessian as its Jacobian
+    dY = np.zeros_like(Y)
+    dY[_staircase_order(Y)] = np.c_[np.arange(5), -np.arange(5)] * 1e-3
+    hvh._compute_gradient(Y + dY)
+    assert np.allclose(hvh._derivative_cache["HVdY"] - grad, (H @ dY.ravel()).reshape(5, 2))
+
+
+def test_2D_banded_newton_step(monkeypatch):
+    p = np.linspace(0, 2, 10)
+    X0 = np.c_[p, p - 2]
+    X0[[2, 7]] = [[-2, -2], [2, 2]]  # outside of the reference box
+    kwargs = dict(n_var=2, n_obj=2, ref=np.array([12, 12]), func=MOP1, jac=MOP1_Jacobian, hessian=MOP1_Hessian)
+    for sparse in (False, True):
+        opt = HVN(**kwargs, N=10, X0=X0, xl=-2, xu=2, max_iters=1, verbose=False, sparse=sparse)
+        assert np.all(opt.state.Y[[2, 7]].max(axis=1) > 12)
+        sizes = []
+        lstsq = np.linalg.lstsq
+        monkeypatch.setattr(np.linalg, "lstsq", lambda A, *args, **kw: sizes.append(len(A)) or lstsq(A, *args, **kw))
+        step = opt._compute_netwon_step(opt.state)[0]
+        monkeypatch.undo()
+        # the points outside are solved on their own, such that the full system never falls back to `lstsq`
+        assert max(sizes) == 2
+        assert np.all(step[[2, 7]] == 0)
+        # the banded solve is the least-squares solution of the full system
+        _, grad, DR = opt.indicator.compute_value_and_derivatives(opt.state.primal, opt.state.Y, YdX=opt.state.J)
+        # the Hessian is assembled from the non-zero entries of `HVdY2` whatever `sparse` is
+        assert issparse(DR)
+        DR = DR.toarray()
+        assert np.allclose(step.ravel(), -1 * np.linalg.lstsq(DR, grad.ravel(), rcond=None)[0])
@@ -194,7 +194,7 @@ def MOP1_Hessian(x):
 hvh = HypervolumeDerivatives(n_var=3, n_obj=3, ref=ref, func=MOP1, jac=MOP1_Jacobian, hessian=MOP1_Hessian)
 
 
-def test_against_autograd():
+def test_against_automatic_differentiation():
     for _ in range(5):
         w = np.random.rand(20, 3)
         w /= np.sum(w, axis=1).reshape(-1, 1)
@@ -206,3 +206,32 @@ def test_against_autograd():
         assert np.all(np.isclose(AD["HVdX"], out["HVdX"]))
         assert np.all(np.isclose(AD["HVdY2"], out["HVdY2"]))
         assert np.all(np.isclose(AD["HVdX2"], out["HVdX2"]))
+
+
+def test_sparse_hessian():
+    hvh_sparse = HypervolumeDerivatives(
+        n_var=3, n_obj=3, ref=ref, func=MOP1, jac=MOP1_Jacobian, hessian=MOP1_Hessian, sparse=True
+    )
+    w = np.random.default_rng(42).random((20, 3))
+    w /= np.sum(w, axis=1).reshape(-1, 1)
+    X = w @ np.vstack([c1, c2, c3])
+    out = hvh._compute_hessian(X)
+    out_sparse = hvh_sparse._compute_hessian(X)
+    assert np.all(np.isclose(out["HVdX"], out_sparse["HVdX"]))
+    assert np.all(np.isclose(out["HVdY2"], out_sparse["HVdY2"].toarray()))
+    assert np.all(np.isclose(out["HVdX2"], out_sparse["HVdX2"].toarray()))
+
+
+def test_hessian_vector_product():
+    rng = np.random.default_rng(42)
+    w = rng.random((20, 3))
+    w /= np.sum(w, axis=1).reshape(-1, 1)
+    X = w @ np.vstack([c1, c2, c3])
+    HVdX2 = hvh._compute_hessian(X)["HVdX2"]
+    for _ in range(3):
+        v = rng.random((20, 3))
+        assert np.all(np.isclose(hvh.hessian_vector_product(X, v).ravel(), HVdX2 @ v.ravel()))
+    # the factors are not reused for other objective points or Jacobians at the same `X`
+    Y, YdX = np.array([MOP1(x) for x in X]) * 0.5, np.array([MOP1_Jacobian(x) for x in X]) * 0.5
+    HVdX2 = hvh._compute_hessian(X, Y=Y, YdX=YdX)["HVdX2"]
+    assert np.all(np.isclose(hvh.hessian_vector_product(X, v, Y=Y, YdX=YdX).ravel(), HVdX2 @ v.ravel()))
@@ -4,6 +4,9 @@ import numpy as np
 import pytest
 
 from hvd import HypervolumeDerivatives
+from hvd.base import State
+from hvd.hypervolume import hypervolume
+from hvd.utils import non_domin_sort
 
 np.set_printoptions(edgeitems=30, linewidth=100000)
 
@@ -58,3 +61,181 @@ def test_4D(n_objective):
         assert np.all(np.isclose(AD["HVdX"], out["HVdX"], atol=1e-5, rtol=1e-8))
         assert np.all(np.isclose(AD["HVdY2"], out["HVdY2"], atol=1e-5, rtol=1e-8))
         assert np.all(np.isclose(AD["HVdX2"], out["HVdX2"], atol=1e-5, rtol=1e-8))
+
+
+@pytest.mark.parametrize("n_objective", [3, 4])
+def test_projections(n_objective):
+    rng = np.random.default_rng(42)
+    # ties along each axis and dominated points
+    Y = np.round(rng.random((30, n_objective)) * 5) / 5
+    ref = np.full(n_objective, 2)
+    hvh = HypervolumeDerivatives(n_var=n_objective, n_obj=n_objective, ref=ref)
+    for k in range(n_objective):
+        for i, y_, pareto_front_, ref_, idx in hvh._projections(k, Y, ref):
+            below = np.nonzero(Y[:, k] < Y[i, k])[0]
+            if len(below) > 0:
+                below = below[non_domin_sort(np.delete(Y[below], k, axis=1), only_front_indices=True)[0]]
+            assert np.array_equal(idx, below)
+            assert np.all(y_ == np.delete(Y[i], k)) and np.all(pareto_front_ == np.delete(Y[idx], k, axis=1))
+
+
+def test_parallel_hessian():
+    rng = np.random.default_rng(42)
+    Y = rng.random((15, 4))
+    Y /= np.linalg.norm(Y, axis=1).reshape(-1, 1)
+    ref = np.full(4, 2)
+    out = HypervolumeDerivatives(n_var=4, n_obj=4, ref=ref)._compute_hessian(Y)
+    out_ = HypervolumeDerivatives(n_var=4, n_obj=4, ref=ref, n_jobs=2)._compute_hessian(Y)
+    assert np.array_equal(out["HVdY2"], out_["HVdY2"])
+    assert np.array_equal(out["HVdX2"], out_["HVdX2"])
+
+
+def test_parallel_hessian_outside_reference():
+    Y = np.array([[3.0, 3.0, 3.0], [4.0, 4.0, 4.0]])
+    ref = np.full(3, 2)
+    out = HypervolumeDerivatives(n_var=3, n_obj=3, ref=ref)._compute_hessian(Y)
+    out_ = HypervolumeDerivatives(n_var=3, n_obj=3, ref=ref, n_jobs=2)._compute_hessian(Y)
+    assert np.array_equal(out["HVdY2"], out_["HVdY2"])
+    assert np.all(out_["HVdY2"] == 0)
+
+
+@pytest.mark.parametrize("n_chunks", [1, 4, 40])
+def test_sweep_chunks(n_chunks):
+    rng = np.random.default_rng(42)
+    # ties along the first objective, which stay in one part of the sweep
+    Y = np.c_[rng.integers(0, 5, size=30), rng.random((30, 2))]
+    hvh = HypervolumeDerivatives(n_var=3, n_obj=3, ref=np.full(3, 6))
+    hvh.objective_points = Y
+    rows, cols, values = hvh._hessian_entries_axis(0)
+    chunks = hvh._sweep_chunks(0, n_chunks)
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(Y)
+    assert sum(count for *_, count in chunks) == len(rows)
+    blocks = [hvh._hessian_entries_axis(0, start, stop, archive=archive) for start, stop, archive, _ in chunks]
+    for v, v_ in zip((rows, cols, values), zip(*blocks)):
+        assert np.array_equal(v, np.concatenate(v_))
+
+
+@pytest.mark.parametrize("n_jobs", [None, -1])
+def test_n_jobs(n_jobs):
+    hvh = HypervolumeDerivatives(n_var=3, n_obj=3, ref=np.full(3, 2), n_jobs=n_jobs)
+    assert hvh.n_jobs >= 1
+    assert hvh.n_jobs == 1 or n_jobs == -1
+    with pytest.raises(ValueError):
+        HypervolumeDerivatives(n_var=3, n_obj=3, ref=np.full(3, 2), n_jobs=0)
+
+
+@pytest.mark.parametrize("n_objective", [3, 4])
+def test_incremental_derivatives(n_objective):
+    rng = np.random.default_rng(42)
+    func, jac, hessian = MOP1(n_objective)
+    w = rng.random((15, n_objective))
+    X = w / np.sum(w, axis=1).reshape(-1, 1)
+    ref = np.full(n_objective, 3)
+    kwargs = dict(n_var=n_objective, n_obj=n_objective, ref=ref, func=func, jac=jac, hessian=hessian)
+    hvh, hvh_ = HypervolumeDerivatives(**kwargs), HypervolumeDerivatives(**kwargs)
+    hvh.compute_derivatives(X)
+    for _ in range(3):
+        changed = rng.choice(15, size=2, replace=False)
+        X = X.copy()
+        X[changed] += rng.normal(0, 0.1, size=(2, n_objective))
+        grad, H = hvh.compute_derivatives(X, changed=changed)
+        grad_, H_ = hvh_.compute_derivatives(X)
+        assert np.array_equal(grad, grad_)
+        assert np.array_equal(H, H_)
+
+
+@pytest.mark.parametrize("n_objective", [2, 3, 4])
+def test_value_and_derivatives(n_objective):
+    rng = np.random.default_rng(42)
+    func, jac, hessian = MOP1(n_objective)
+    w = rng.random((10, n_objective))
+    X = w / np.sum(w, axis=1).reshape(-1, 1)
+    Y = np.array([func(x) for x in X])
+    ref = np.full(n_objective, 3)
+    hvh = HypervolumeDerivatives(n_var=n_objective, n_obj=n_objective, ref=ref, func=func, jac=jac, hessian=hessian)
+    value, grad, H = hvh.compute_value_and_derivatives(X)
+    grad_, H_ = hvh.compute_derivatives(X)
+    assert np.isclose(value, hypervolume(Y, ref), rtol=1e-12)
+    assert np.array_equal(grad, grad_)
+    assert np.array_equal(H, H_)
+
+
+@pytest.mark.parametrize("n_objective", [2, 4])
+def test_memory_limit(n_objective):
+    rng = np.random.default_rng(42)
+    func, jac, hessian = MOP1(n_objective)
+    w = rng.random((15, n_objective))
+    X = w / np.sum(w, axis=1).reshape(-1, 1)
+    ref = np.full(n_objective, 3)
+    hvh = HypervolumeDerivatives(n_var=n_objective, n_obj=n_objective, ref=ref, func=func, jac=jac, hessian=hessian)
+    H = hvh._compute_hessian(X)["HVdX2"]
+    footprints = {hvh.hessian_strategy: hvh.hessian_memory}
+    # tighten the budget until the matrix-free Hessian is taken
+    while hvh.hessian_strategy != "matrix-free":
+        hvh.memory_limit = hvh.hessian_memory - 1
+        out = hvh._compute_hessian(X)
+        assert hvh.hessian_memory <= hvh.memory_limit
+        footprints[hvh.hessian_strategy] = hvh.hessian_memory
+        H_ = out["HVdX2"].toarray() if hasattr(out["HVdX2"], "toarray") else out["HVdX2"] @ np.eye(len(H))
+        assert np.allclose(H_, H, atol=1e-12)
+    # strategies are taken by preference and skipped if they need more memory than a later one
+    assert list(footprints)[:2] == ["dense", "chunked"]
+    assert set(footprints) <= {"dense", "chunked", "sparse", "matrix-free"}
+    hvh.memory_limit = 1
+    with pytest.raises(MemoryError):
+        hvh._compute_hessian(X)
+
+
+def test_batched_callables():
+    n_objective = 3
+    rng = np.random.default_rng(42)
+    func, jac, hessian = MOP1(n_objective)
+    w = rng.random((10, n_objective))
+    X = w / np.sum(w, axis=1).reshape(-1, 1)
+    ref = np.full(n_objective, 3)
+    batch = dict(
+        func_batch=lambda X: np.array([func(x) for x in X]),
+        jac_batch=lambda X: np.array([jac(x) for x in X]),
+        hess_batch=lambda X: np.array([hessian(x) for x in X]),
+    )
+    grad, H = HypervolumeDerivatives(n_objective, n_objective, ref, func, jac, hessian).compute_derivatives(X)
+    # the per-point callables are not used if the batched ones are given
+    hvh = HypervolumeDerivatives(n_objective, n_objective, ref, **batch)
+    grad_, H_ = hvh.compute_derivatives(X)
+    assert np.array_equal(grad, grad_) and np.array_equal(H, H_)
+    state = State(n_objective, 0, 0, None, None, func_batch=batch["func_batch"], jac_batch=batch["jac_batch"])
+    state.update(X)
+    assert np.array_equal(state.J, batch["jac_batch"](X)) and state.n_jac_evals == len(X)
+
+
+@pytest.mark.parametrize("n_objective", [2, 3, 4, 5])
+def test_hypervolume_dY_batch(n_objective):
+    rng = np.random.default_rng(42)
+    Y = rng.random((20, n_objective))
+    Y /= np.linalg.norm(Y, axis=1).reshape(-1, 1)
+    Y = Y[non_domin_sort(Y, only_front_indices=True)[0]]
+    # a sweep of reference points with a few of them not dominated by all points
+    refs = np.r_[1.1 + rng.random((30, n_objective)), 0.9 + rng.random((3, n_objective)) * 0.2]
+    hvh = HypervolumeDerivatives(n_var=n_objective, n_obj=n_objective, ref=refs[0])
+    HVdY, value = hvh.hypervolume_dY_batch(Y, refs, return_value=True)
+    assert HVdY.shape == (len(refs), *Y.shape)
+    for r, ref in enumerate(refs):
+        assert np.allclose(HVdY[r], hvh.hypervolume_dY(Y, ref), rtol=1e-10, atol=1e-12)
+        assert np.isclose(value[r], hypervolume(Y, ref), rtol=1e-10)
+    with pytest.raises(ValueError):
+        hvh.hypervolume_dY_batch(Y, refs[:, 1:])
+
+
+@pytest.mark.parametrize("n_objective", [3, 4])
+def test_points_outside_reference(n_objective):
+    rng = np.random.default_rng(1)
+    Y = rng.random((8, n_objective))
+    Y /= np.linalg.norm(Y, axis=1).reshape(-1, 1)
+    # a point outside of the reference box, which dominates the inside ones in the first objective
+    Y[0] = np.r_[0.1, np.full(n_objective - 1, 1.5)]
+    Y[1, -1] = 1.2
+    hvh = HypervolumeDerivatives(n_var=n_objective, n_obj=n_objective, ref=np.ones(n_objective))
+    out = hvh._compute_hessian(Y)
+    AD = hvh.compute_automatic_differentiation(Y)
+    assert np.allclose(out["HVdY"], np.ravel(AD["HVdY"]), atol=1e-12)
+    assert np.allclose(out["HVdY2"], AD["HVdY2"], atol=1e-12)
@@ -0,0 +1,265 @@
+import itertools
+import tracemalloc
+
+import numpy as np
+import pytest
+
+import hvd.hypervolume
+from hvd.hypervolume import (
+    DynamicHypervolume2D,
+    HyperVolume,
+    LimitSetHypervolume3D,
+    MultiList,
+    _auto_engine,
+    hypervolume,
+    hypervolume_2d,
+    hypervolume_3d,
+    hypervolume_4d,
+    hypervolume_batch,
+    hypervolume_contributions,
+    hypervolume_gradient_3d,
+    hypervolume_mc,
+    hypervolume_wfg,
+)
+
+np.random.seed(42)
+
+
+def grid_hypervolume(Y: np.ndarray, ref: np.ndarray) -> float:
+    """brute-force hypervolume of non-negative integer points by counting the dominated unit cells"""
+    cells = np.array(list(itertools.product(*[range(int(r)) for r in ref])))
+    return float(np.sum(np.any(np.all(Y[:, None, :] <= cells[None, :, :], axis=2), axis=0)))
+
+
+def test_2D_example():
+    Y = np.array([(10, 1), (9.5, 3), (8, 6.5), (4, 8), (1, 9)])
+    assert hypervolume_2d(Y, [11, 10]) == 1 * 9 + 0.5 * 7 + 1.5 * 3.5 + 4 * 2 + 3 * 1
+    assert hypervolume(Y, [11, 10]) == hypervolume_2d(Y, [11, 10])
+    assert hypervolume(np.zeros((0, 2)), [11, 10]) == 0
+
+
+@pytest.mark.parametrize("N", [1, 5, 30])
+def test_2D_against_grid(N):
+    ref = np.array([10, 9])
+    for _ in range(10):
+        # integer points create ties, duplicates, dominated points and points outside of `ref`
+        Y = np.random.randint(0, 12, size=(N, 2)).astype(float)
+        assert hypervolume(Y, ref) == grid_hypervolume(Y, ref)
+
+
+def test_3D_example():
+    Y = np.array([(8, 7, 10), (4, 11, 17), (2, 9, 21)])
+    ref = np.array([10, 13, 23])
+    # slices between consecutive values of the third objective
+    assert hypervolume_3d(Y, ref) == 7 * (2 * 6) + 4 * (4 * 2 + 2 * 6) + 2 * (6 * 4 + 2 * 6)
+    assert hypervolume(Y, ref) == hypervolume_3d(Y, ref)
+
+
+@pytest.mark.parametrize("N", [1, 5, 30])
+def test_3D_against_grid(N):
+    ref = np.array([8, 9, 7])
+    for _ in range(10):
+        Y = np.random.randint(0, 10, size=(N, 3)).astype(float)
+        assert hypervolume(Y, ref) == grid_hypervolume(Y, ref)
+
+
+@pytest.mark.parametrize("N", [1, 5, 20])
+def test_4D_against_grid(N):
+    ref = np.array([5, 6, 5, 6])
+    for _ in range(10):
+        Y = np.random.randint(0, 7, size=(N, 4)).astype(float)
+        assert hypervolume_4d(Y, ref) == grid_hypervolume(Y, ref)
+
+
+def test_4D_against_recursion():
+    ref = np.ones(4) * 1.1
+    for _ in range(5):
+        Y = np.random.rand(50, 4)
+        Y /= np.linalg.norm(Y, axis=1, keepdims=True)
+        assert np.isclose(hypervolume_4d(Y, ref), hypervolume(Y, ref, engine="python"))
+
+
+@pytest.mark.parametrize("n_objective", [5, 6])
+def test_many_objectives_against_grid(n_objective):
+    ref = np.array([5, 6, 5, 6, 5, 6])[:n_objective]
+    for _ in range(5):
+        Y = np.random.randint(0, 7, size=(15, n_objective)).astype(float)
+        assert hypervolume(Y, ref) == grid_hypervolume(Y, ref)
+        assert hypervolume(Y, ref, engine="python") == grid_hypervolume(Y, ref)
+
+
+@pytest.mark.parametrize("n_objective", [3, 4, 5, 6, 8])
+def test_WFG_engine(n_objective):
+    pytest.importorskip("numba")
+    ref = np.ones(n_objective) * 1.1
+    for _ in range(3):
+        Y = np.random.rand(30, n_objective)
+        Y /= np.linalg.norm(Y, axis=1, keepdims=True)
+        assert np.isclose(hypervolume_wfg(Y, ref), hypervolume(Y, ref, engine="numba"))
+    # dominated, duplicated points and points outside of the reference box
+    Y = np.random.randint(0, 7, size=(15, n_objective)).astype(float)
+    Y = np.r_[Y, Y[:3]]
+    ref = np.full(n_objective, 5)
+    assert hypervolume(Y, ref, engine="wfg") == hypervolume(Y, ref, engine="python")
+    assert hypervolume_wfg(np.zeros((0, n_objective)), ref) == 0
+
+
+def test_multilist_memory():
+    N, dim = 100000, 5
+    points = np.random.rand(N, dim)
+    tracemalloc.start()
+    hv = HyperVolume(np.ones(dim), engine="python")
+    hv.preProcess(points)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # cargo, area and volume in float64, links in intp, plus one `ignore` flag per node
+    assert hv.list.nbytes == (N + 1) * (5 * dim + 1) * 8
+    # nothing but the arrays is kept alive, and sorting the lists only needs temporary index arrays
+    assert current < 1.01 * hv.list.nbytes
+    assert peak < 1.5 * hv.list.nbytes
+
+
+def test_multilist_links():
+    multi_list = MultiList(2, np.array([[1.0, 3.0], [2.0, 2.0], [3.0, 1.0]]))
+    multi_list.extend(np.array([1, 2]), 0)
+    multi_list.append(3, 0)
+    multi_list.extend(np.array([3, 2, 1]), 1)
+    assert [multi_list.getLength(i) for i in range(2)] == [3, 3]
+    bounds = [np.inf, np.inf]
+    multi_list.remove(2, 2, bounds)
+    assert bounds == [2.0, 2.0]
+    assert multi_list.next[1, 0] == 3 and multi_list.prev[3, 0] == 1
+    assert multi_list.next[3, 1] == 1 and multi_list.prev[1, 1] == 3
+    multi_list.reinsert(2, 2, bounds)
+    assert multi_list.next.tolist() == [[1, 3], [2, 0], [3, 1], [0, 2]]
+    assert multi_list.prev.tolist() == [[3, 1], [0, 2], [1, 3], [2, 0]]
+
+
+@pytest.mark.parametrize("n_objective", [2, 3, 4, 5])
+def test_numba_engine(n_objective):
+    pytest.importorskip("numba")
+    ref = np.ones(n_objective) * 1.1
+    for _ in range(5):
+        Y = np.random.rand(30, n_objective)
+        Y /= np.linalg.norm(Y, axis=1, keepdims=True)
+        assert np.isclose(hypervolume(Y, ref, engine="numba"), hypervolume(Y, ref, engine="python"))
+    # dominated and duplicated points
+    Y = np.array([[0, 3, 2, 3, 1], [3, 3, 0, 3, 1], [3, 3, 0, 2, 1], [3, 3, 0, 2, 1]])[:, :n_objective]
+    ref = np.full(n_objective, 4)
+    assert hypervolume(Y, ref, engine="numba") == grid_hypervolume(Y, ref)
+
+
+@pytest.mark.parametrize(
+    "n_objective, with_numba, engine",
+    [
+        (2, True, "2d"),
+        (3, True, "3d"),
+        (4, True, "numba"),
+        (5, True, "wfg"),
+        (2, False, "2d"),
+        (3, False, "3d"),
+        (4, False, "4d"),
+        (5, False, "python"),
+    ],
+)
+def test_auto_engine(monkeypatch, n_objective, with_numba, engine):
+    if with_numba:
+        pytest.importorskip("numba")
+    else:
+        monkeypatch.setattr(hvd.hypervolume, "jit", None)
+    assert _auto_engine(n_objective) == engine
+    ref = np.array([5, 6, 5, 6, 5])[:n_objective]
+    Y = np.random.randint(0, 7, size=(15, n_objective)).astype(float)
+    hv = HyperVolume(ref)
+    assert hv.compute(Y) == grid_hypervolume(Y, ref)
+    # only the recursions build the linked lists
+    assert isinstance(hv.list, MultiList) == (engine in ("numba", "python"))
+
+
+def test_engine_switch():
+    with pytest.raises(ValueError):
+        HyperVolume([1, 1], engine="C")
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_hypervolume_batch(n_jobs):
+    ref = np.full(3, 5)
+    fronts = [np.random.randint(0, 7, size=(n, 3)) for n in np.random.randint(0, 20, size=30)] + [np.random.rand(300, 3)]
+    values = hypervolume_batch(fronts, ref, n_jobs=n_jobs)
+    assert np.allclose(values, [hypervolume(F, ref) for F in fronts])
+    assert len(hypervolume_batch([], ref)) == 0
+
+
+@pytest.mark.parametrize("method", ["sobol", "halton", "random"])
+def test_hypervolume_mc(method):
+    # a fixed front, since the standard error is itself estimated from a few replicates
+    X = np.random.default_rng(42).random((30, 6))
+    X /= np.linalg.norm(X, axis=1, keepdims=True)
+    ref = np.full(6, 1.1)
+    hv = hypervolume(X, ref)
+    value, se = hypervolume_mc(X, ref, n_samples=2**14, method=method, seed=42)
+    assert 0 < se < 0.05 * hv
+    assert abs(value - hv) < 5 * se
+    assert hypervolume_mc(X + 2, ref) == (0.0, 0.0)
+    with pytest.raises(ValueError):
+        hypervolume_mc(X, ref, method="grid")
+
+
+@pytest.mark.parametrize("n_objective", [2, 3, 4])
+def test_contributions(n_objective):
+    ref = np.full(n_objective, 5)
+    # integer points with ties, duplicates, dominated points and points outside of the reference box
+    for F in [np.random.randint(0, 7, size=(30, n_objective)), np.random.rand(50, n_objective) * 5]:
+        hv = hypervolume(F, ref)
+        hvc = [hv - hypervolume(np.delete(F, i, axis=0), ref) for i in range(len(F))]
+        assert np.allclose(hypervolume_contributions(F, ref), hvc)
+
+
+def test_gradient_3D():
+    ref = np.full(3, 1.1)
+    Y = np.random.rand(40, 3)
+    grad = hypervolume_gradient_3d(Y, ref)
+    # the hypervolume is piecewise linear in each coordinate
+    eps = 1e-7
+    for i in range(len(Y)):
+        for k in range(3):
+            Y_ = Y.copy()
+            Y_[i, k] += eps
+            assert np.isclose(grad[i, k], (hypervolume(Y_, ref) - hypervolume(Y, ref)) / eps, atol=1e-5)
+
+
+@pytest.mark.parametrize("cls, n_objective", [(DynamicHypervolume2D, 2), (LimitSetHypervolume3D, 3)])
+def test_dynamic_hypervolume(cls, n_objective):
+    ref = np.full(n_objective, 5)
+    archive = cls(ref, F=np.random.randint(0, 7, size=(8, n_objective)).astype(float))
+    for _ in range(30):
+        y = np.random.randint(0, 7, size=n_objective).astype(float)
+        op = np.random.randint(3)
+        if op == 0 or len(archive.F) == 0:
+            archive.add(y.reshape(1, -1))
+        elif op == 1:
+            archive.delete(np.random.randint(len(archive.F)))
+        else:
+            archive.move(np.random.randint(len(archive.F)), y)
+        hv = hypervolume(archive.F, ref)
+        hvc = [hv - hypervolume(np.delete(archive.F, i, axis=0), ref) for i in range(len(archive.F))]
+        assert np.isclose(archive.hv, hv)
+        assert np.allclose(archive.hvc, hvc)
+
+
+def test_dynamic_hypervolume_2D_dominated_points():
+    ref = np.array([10.0, 10.0])
+    # a staircase shading many dominated points, which are restored when it is deleted
+    archive = DynamicHypervolume2D(ref, F=np.r_[[[1.0, 6.0], [3.0, 3.0], [6.0, 1.0]], 3 + 6 * np.random.rand(50, 2)])
+    for _ in range(3):
+        archive.delete(0)
+        hv = hypervolume(archive.F, ref)
+        hvc = [hv - hypervolume(np.delete(archive.F, i, axis=0), ref) for i in range(len(archive.F))]
+        assert np.isclose(archive.hv, hv)
+        assert np.allclose(archive.hvc, hvc)
+
+
+def test_limit_set_hypervolume_affected_blocks():
+    archive = LimitSetHypervolume3D(np.full(3, 1.1), F=np.random.rand(40, 3))
+    for y in np.random.rand(5, 3):
+        assert np.array_equal(archive._affected(y, chunk_size=50), archive._affected(y))
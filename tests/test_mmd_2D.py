@@ -6,11 +6,13 @@ os.environ["JAX_ENABLE_X64"] = "True"
 
 import jax.numpy as jnp
 import numpy as np
+import pytest
 from jax import jacfwd, jacrev, jit
 
 sys.path.insert(0, "./")
 
-from hvd.mmd import MMD
+from hvd.mmd import MMD, _hessian_footprints
+from hvd.utils import choose_hessian_strategy
 
 np.random.seed(42)
 
@@ -106,5 +108,28 @@ def test_2D_decision_space_against_ad():
     assert np.all(np.isclose(H, H_ad))
 
 
+def test_2D_memory_limit():
+    mmd = MMD(n_var=dim, n_obj=2, ref=ref, func=MOP1, jac=MOP1_Jacobian, hessian=MOP1_Hessian)
+    H = mmd.compute_hessian(X)["MMDdX2"]
+    assert mmd.hessian_strategy == "dense"
+    # the budget excludes a dense Hessian in the decision space
+    mmd.memory_limit = mmd.hessian_memory - 1
+    H_ = mmd.compute_hessian(X)["MMDdX2"]
+    assert mmd.hessian_strategy == "matrix-free" and mmd.hessian_memory <= mmd.memory_limit
+    assert np.allclose(H_ @ np.eye(N * dim), H)
+
+
+def test_hessian_footprints_large():
+    N, dim_x, dim_y = 20000, 30, 3
+    footprints = _hessian_footprints(N, dim_x, dim_y)
+    base = 8 * (N * dim_y) ** 2 + 8 * N * dim_y * dim_x * (dim_x + 2)
+    assert footprints == {"dense": base + 8 * (N * dim_x) ** 2, "matrix-free": base + 8 * N * dim_x**2}
+    assert all(type(v) is int and v > 0 for v in footprints.values())
+    assert footprints["dense"] > 2.9e12
+    # neither fits in 1 GB
+    with pytest.raises(MemoryError):
+        choose_hessian_strategy(footprints, 10**9)
+
+
 test_2D_objective_space_against_ad()
 test_2D_decision_space_against_ad()